@@ -1,215 +1,409 @@
 import argparse
-import logging
-import math
+import mmap
 import os
-import re
-import json
-from datetime import datetime
-from time import sleep
+import queue
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from time import monotonic, time
 from typing import Any, Dict, List
 
-from azure.storage.blob import BlobServiceClient
+import orjson
+import requests
+from azure.core.pipeline.transport import RequestsTransport
+from azure.storage.blob import BlobServiceClient, ContainerClient, ContentSettings
+from bson import encode as bson_encode
+from bson.raw_bson import RawBSONDocument
 from dotenv import load_dotenv
-from pymongo import MongoClient
-from pymongo.errors import BulkWriteError, ServerSelectionTimeoutError
+from pymongo import MongoClient, WriteConcern
+from pymongo.errors import BulkWriteError, PyMongoError, ServerSelectionTimeoutError
+from requests.adapters import HTTPAdapter
+
+# Before the src imports, so loggers and settings created at import see the .env values
+load_dotenv()
 
 from src.api import ECourtsScraper
-from src.parser import batch_process_judgments, case_details_parser, extract_years_data
-from src.utils import get_all_dates_in_year
+from src.parser import extract_years_data, parse_case_detail
+from src.store import SeenUrlStore
+from src.utils import decode_env, divide_data, get_all_dates_in_year, setup_logger
 
 from config import *
 
-load_dotenv()
-
 DISPLAY_CASE = 25
 BATCH_SIZE = 25
+# Batches in a full result page, the common case
+BATCH_COUNT_FULL = -(-DISPLAY_CASE // BATCH_SIZE)
 STATE_CODE = CALCUTTA_HIGH_COURT
 COURT_NAME = "CALCUTTA_HIGH_COURT"
+_COURT_LABEL = COURT_NAME.replace("_", " ").lower()
+
+# Parallel block uploads per PDF; lower it on low-bandwidth servers
+AZURE_UPLOAD_CONCURRENCY = int(os.getenv("AZURE_UPLOAD_CONCURRENCY", "8"))
+PDF_CONTENT_SETTINGS = ContentSettings(content_type="application/pdf")
 
+# Keep-alive connections to the storage account; enough for every case worker to
+# upload with full block concurrency without opening fresh sockets
+AZURE_POOL_SIZE = 32
+AZURE_BLOCK_SIZE = 8 * 1024 * 1024
 
-# Configure logging
-def setup_logger(name: str = "main", level: int = logging.INFO) -> logging.Logger:
-    logger = logging.getLogger(name)
-    if logger.handlers:
-        return logger
+# Result pages fetched ahead of the page whose cases are being processed, and how many are fetched at once
+PAGE_PREFETCH = 4
+PAGE_FETCH_WORKERS = 4
 
-    logger.setLevel(level)
-    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+# Processed cases are buffered and written to MongoDB in large unordered bulks
+MONGO_FLUSH_SIZE = 1000
 
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+# Cases in a batch are network-bound (eCourts download + Azure upload), so they
+# are processed concurrently on one pool that lives as long as main().
+CASE_WORKERS = min(int(os.getenv("CASE_WORKERS", str(BATCH_SIZE))), 32)
+_case_executor = ThreadPoolExecutor(max_workers=CASE_WORKERS, thread_name_prefix="case")
 
-    os.makedirs("logs", exist_ok=True)
-    file_handler = logging.FileHandler(f'logs/main_{__import__("time").strftime("%Y%m%d")}.log')
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+# Output directories are created once here rather than on every log/state/dead-letter write
+for _output_dir in ("logs", "state_files", "failed_cases"):
+    os.makedirs(_output_dir, exist_ok=True)
 
-    return logger
 
+logger = setup_logger("main")
 
-logger = setup_logger()
+# Progress checkpoints inside a date window are throttled; phase boundaries always write
+STATE_SAVE_INTERVAL = 30.0
+_last_save_ts = 0.0
+_last_saved_progress = None
 
 
-def save_state(state, server_no):
-    """Save the current state to a local JSON file"""
+def save_state(state, server_no, force=False):
+    """Save the current state to a local JSON file.
+
+    Unless forced, the write is skipped when the progress indices are unchanged since the last
+    save or when the last save was less than STATE_SAVE_INTERVAL seconds ago.
+    """
+    global _last_save_ts, _last_saved_progress
+
+    now = monotonic()
+    progress = (
+        state["current_year_index"],
+        state["current_date_index"],
+        state["current_request"],
+        state["current_batch"],
+        state["completed"],
+    )
+    if not force and (progress == _last_saved_progress or now - _last_save_ts < STATE_SAVE_INTERVAL):
+        return
+
     state_dir = "state_files"
-    os.makedirs(state_dir, exist_ok=True)
 
+    # Write to a sibling file and swap it in so a crash never leaves a truncated state file
     filename = f"{state_dir}/scraper_state_{state['state_code']}_{server_no}.json"
-    with open(filename, "w") as f:
-        json.dump(state, f, indent=2)
-    logger.info(f"State saved to {filename}")
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "wb") as f:
+        f.write(orjson.dumps(state))
+    os.replace(tmp_filename, filename)
+
+    _last_save_ts = now
+    _last_saved_progress = progress
+    logger.debug("State saved to %s", filename)
 
 
 def load_state(state_code, server_no):
     """Load state from a local JSON file if it exists"""
     filename = f"state_files/scraper_state_{state_code}_{server_no}.json"
     if os.path.exists(filename):
-        with open(filename, "r") as f:
-            state = json.load(f)
-        logger.info(f"Loaded existing state from {filename}")
+        with open(filename, "rb") as f:
+            state = orjson.loads(f.read())
+        logger.info("Loaded existing state from %s", filename)
         return state
     return None
 
 
-def upload_to_azure_and_delete_local(
-    file_path: str, blob_service_client: BlobServiceClient, container_name: str
-) -> str:
+def upload_to_azure_and_delete_local(file_path: str, blob_name: str, container_client: ContainerClient) -> str:
     """Upload PDF to Azure Blob Storage and delete local file"""
     try:
-        blob_name = os.path.basename(file_path)
-        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
-
-        logger.info(f"Uploading {file_path} to Azure Blob Storage")
-        with open(file_path, "rb") as data:
-            blob_client.upload_blob(data, overwrite=True)
+        blob_client = container_client.get_blob_client(blob_name)
+
+        logger.debug("Uploading %s to Azure Blob Storage", file_path)
+        file_size = os.path.getsize(file_path)
+        # Memory-map the PDF so blocks are read from the page cache instead of buffered copies
+        with open(file_path, "rb") as f, (
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if file_size else nullcontext(b"")
+        ) as data:
+            blob_client.upload_blob(
+                data,
+                length=file_size,
+                blob_type="BlockBlob",
+                overwrite=True,
+                content_settings=PDF_CONTENT_SETTINGS,
+                max_concurrency=AZURE_UPLOAD_CONCURRENCY,
+            )
 
         # Delete local file
-        os.remove(file_path)
-        logger.info(f"Deleted local file: {file_path}")
+        os.unlink(file_path)
+        logger.debug("Deleted local file: %s", file_path)
 
         # Return Azure Blob URL
-        blob_url = f"https://{blob_service_client.account_name}.blob.core.windows.net/{container_name}/{blob_name}"
-        logger.info(f"Successfully uploaded to: {blob_url}")
+        blob_url = blob_client.url
+        logger.debug("Successfully uploaded to: %s", blob_url)
         return blob_url
 
     except Exception as e:
-        logger.error(f"Error uploading to Azure/deleting local file: {str(e)}", exc_info=True)
+        logger.error("Error uploading to Azure/deleting local file: %s", e, exc_info=True)
         return ""
 
 
+def upload_stream_to_azure(pdf_response, container_client: ContainerClient) -> str:
+    """Upload a streaming PDF response straight to Azure Blob Storage without a local copy"""
+    try:
+        blob_name = uuid.uuid4().hex + ".pdf"
+        blob_client = container_client.get_blob_client(blob_name)
+
+        # Content-Length is the encoded size when the body is compressed, so only trust it for identity bodies
+        content_length = pdf_response.headers.get("Content-Length")
+        length = int(content_length) if content_length and not pdf_response.headers.get("Content-Encoding") else None
+
+        logger.debug("Streaming %s to Azure Blob Storage", blob_name)
+        blob_client.upload_blob(
+            pdf_response.raw,
+            length=length,
+            blob_type="BlockBlob",
+            overwrite=True,
+            content_settings=PDF_CONTENT_SETTINGS,
+            max_concurrency=AZURE_UPLOAD_CONCURRENCY,
+        )
+
+        blob_url = blob_client.url
+        logger.debug("Successfully uploaded to: %s", blob_url)
+        return blob_url
+
+    except Exception as e:
+        logger.error("Error streaming PDF to Azure: %s", e, exc_info=True)
+        return ""
+    finally:
+        pdf_response.close()
+
+
+class MongoWriter:
+    """Background thread that buffers case documents and bulk-inserts them into MongoDB"""
+
+    def __init__(self, collection, flush_size: int = MONGO_FLUSH_SIZE):
+        self.collection = collection
+        self.flush_size = flush_size
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="mongo-writer", daemon=True)
+        self.thread.start()
+
+    def put(self, docs: List[RawBSONDocument]) -> None:
+        """Queue documents for writing without waiting for MongoDB"""
+        if docs:
+            self.queue.put(docs)
+
+    def flush(self) -> None:
+        """Block until every document queued so far has been written"""
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        """Write everything still queued and stop the writer thread"""
+        self.queue.put(None)
+        self.thread.join()
+
+    def _run(self) -> None:
+        buffer = []
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self._write(buffer)
+                return
+
+            if isinstance(item, threading.Event):
+                self._write(buffer)
+                buffer = []
+                item.set()
+                continue
+
+            buffer.extend(item)
+            if len(buffer) >= self.flush_size:
+                self._write(buffer)
+                buffer = []
+
+    def _write(self, docs: List[RawBSONDocument]) -> None:
+        """Write documents in a single unordered bulk insert"""
+        if not docs:
+            return
+
+        try:
+            self.collection.insert_many(docs, ordered=False, bypass_document_validation=True)
+            logger.info("Stored %d cases in MongoDB", len(docs))
+        except BulkWriteError as bwe:
+            write_errors = bwe.details.get("writeErrors", [])
+            duplicates = sum(1 for error in write_errors if error.get("code") == 11000)
+            logger.error(
+                "Stored %d/%d cases in MongoDB, %d write errors (%d duplicate keys)",
+                bwe.details.get("nInserted", 0),
+                len(docs),
+                len(write_errors),
+                duplicates,
+            )
+            for error in write_errors:
+                if error.get("code") != 11000:
+                    logger.error("MongoDB write error at index %s: %s", error.get("index"), error.get("errmsg"))
+        except Exception as e:
+            logger.error("Error writing to MongoDB: %s", e, exc_info=True)
+
+
 def process_case_batch(
     batch: List[List[Any]],
     scraper: ECourtsScraper,
-    blob_service_client: BlobServiceClient,
-    container_name: str,
-    mongo_collection,
+    container_client: ContainerClient,
+    mongo_writer: MongoWriter,
+    seen_urls: SeenUrlStore,
 ) -> None:
     """Process a batch of cases: parse, download, upload to Azure, and store in MongoDB"""
 
     def process_single_case(case: List[Any]) -> Dict[str, Any]:
         try:
-            case_detail = case_details_parser(case[1])
-            if not case_detail.get("url"):
-                logger.warning(f"No URL found for case: {case_detail.get('title', 'Unknown')}")
-                return case_detail
-
-            case_detail["court"] = COURT_NAME.replace("_", " ").lower()
-
-            # Download PDF
-            local_path = scraper.download_judgment(case_detail["url"])
-            if local_path:
-                # Upload to Azure and get URL
-                azure_url = upload_to_azure_and_delete_local(local_path, blob_service_client, container_name)
-                case_detail["url"] = azure_url
-                # case_detail["local_url"] = local_path
-            else:
-                logger.warning(f"Failed to download PDF for case: {case_detail.get('title', 'Unknown')}")
-                # case_detail["azure_url"] = ""
-                # case_detail["local_url"] = ""
-
-            return case_detail
+            case_detail = parse_case_detail(case[1])
+            pdf_detail = case_detail.url
+            title = case_detail.title or "Unknown"
+            if not pdf_detail:
+                logger.warning("No URL found for case: %s", title)
+                return case_detail.to_dict()
+
+            case_detail.court = _COURT_LABEL
+
+            # The eCourts PDF path identifies a case; the unique index on it rejects re-inserts on resume,
+            # so it is only set once the PDF is in Azure
+            pdf_path = pdf_detail[1]
+
+            # Skip the download and upload entirely if this PDF is already in Azure
+            blob_url = seen_urls.get(pdf_path) if pdf_path else None
+            if blob_url:
+                logger.debug("PDF already uploaded for case: %s", title)
+                case_detail.set("case_id", pdf_path)
+                case_detail.url = blob_url
+                return case_detail.to_dict()
+
+            # Stream the PDF straight into Azure
+            pdf_response = scraper.download_judgment_stream(pdf_detail)
+            azure_url = ""
+            if pdf_response is not None:
+                azure_url = upload_stream_to_azure(pdf_response, container_client)
+
+            # A non-seekable stream cannot be retried by the SDK, so fall back to a local copy
+            if pdf_response is not None and not azure_url:
+                downloaded = scraper.download_judgment(pdf_detail)
+                if downloaded:
+                    # Upload to Azure and get URL
+                    local_path, blob_name = downloaded
+                    azure_url = upload_to_azure_and_delete_local(local_path, blob_name, container_client)
+
+            if not azure_url:
+                # Dead-letter it rather than store the raw eCourts URL, so a re-run can still insert the case
+                logger.warning("Failed to download PDF for case: %s", title)
+                return {"_error": "PDF download or upload failed", "_processing_failed": True, "_case": case}
+
+            if pdf_path:
+                seen_urls.add(pdf_path, azure_url)
+                case_detail.set("case_id", pdf_path)
+            case_detail.url = azure_url
+
+            return case_detail.to_dict()
 
         except Exception as e:
-            logger.error(f"Error processing case: {str(e)}", exc_info=True)
-            return {"_error": str(e), "_processing_failed": True}
-
-    logger.info(f"Processing batch of {len(batch)} cases")
-    processed_cases = batch_process_judgments(batch, process_single_case)
-
-    # Store in MongoDB
-    try:
-        if processed_cases:
-            mongo_collection.insert_many(processed_cases, ordered=False)
-            logger.info(f"Stored {len(processed_cases)} cases in MongoDB")
-    except BulkWriteError as bwe:
-        logger.error(f"Error writing to MongoDB: {str(bwe)}", exc_info=True)
-    except ServerSelectionTimeoutError as sste:
-        logger.error(f"MongoDB connection error: {str(sste)}", exc_info=True)
-
-
-def divide_data(data, n):
+            logger.error("Error processing case: %s", e, exc_info=True)
+            return {"_error": str(e), "_processing_failed": True, "_case": case}
+
+    logger.info("Processing batch of %d cases", len(batch))
+    processed_cases = list(_case_executor.map(process_single_case, batch))
+
+    # Failed cases go to the dead-letter file instead of the collection
+    good_cases = [case for case in processed_cases if not case.get("_processing_failed")]
+    if len(good_cases) < len(processed_cases):
+        record_failed_cases([case for case in processed_cases if case.get("_processing_failed")])
+
+    # Encode to BSON once here so the driver sends the bytes as-is, then hand off to the
+    # MongoDB writer thread so downloads never wait on insert acknowledgements
+    mongo_writer.put([RawBSONDocument(bson_encode(case)) for case in good_cases])
+
+
+def record_failed_cases(failed_cases: List[Dict[str, Any]]) -> None:
+    """Append cases that failed processing to a JSON-lines dead-letter file for later replay"""
+    filename = f"failed_cases/failed_cases_{STATE_CODE}.jsonl"
+    with open(filename, "ab") as f:
+        for case in failed_cases:
+            f.write(orjson.dumps(case, default=str) + b"\n")
+    logger.warning("Recorded %d failed cases in %s", len(failed_cases), filename)
+
+
+def fetch_page(scraper: ECourtsScraper, start_date: str, end_date: str, req_no: int):
+    """Fetch result page req_no of a date window on a fresh session, walking the earlier pages first"""
+    scraper.reset_session()
+    _ = scraper.search_cases()
+
+    search_results = None
+    for i in range(req_no + 1):
+        search_results = scraper.search_cases(
+            from_date=start_date,
+            to_date=end_date,
+            start_from=i * DISPLAY_CASE,
+            display_length=DISPLAY_CASE,
+            page=i,
+        )
+    return search_results
+
+
+def page_producer(
+    scraper_pool: queue.Queue,
+    page_queue: queue.Queue,
+    start_date: str,
+    end_date: str,
+    req_numbers,
+    stop: threading.Event,
+):
+    """Fetch pages concurrently and hand them to the consumer in request order.
+
+    Each page holds its scraper until the consumer returns it to the pool. When no scraper is
+    free, the oldest fetched page is delivered first so the consumer can release one. Once stop
+    is set no new pages are fetched; those already in flight are still delivered, then None.
     """
-    Divides the input data (year: count) into n parts with approximately equal counts.
-    Each year appears in only one part with its actual count.
-
-    Args:
-        data (dict): A dictionary where keys are years (strings) and values are counts (strings).
-        n (int): The number of parts to divide the data into.
-
-    Returns:
-        list: A list of n dictionaries, where each dictionary represents a part of the data.
-              Each part contains a subset of the original data with approximately equal counts.
-    """
-
-    # Convert counts to integers
-    data = {year: int(count) for year, count in data.items()}
 
-    # Sort the data by year
-    sorted_data = sorted(data.items())
-
-    # Calculate the total count
-    total_count = sum(data.values())
-
-    # Calculate the target count for each part
-    target_count = total_count / n
-
-    # Initialize the result list
-    result = [{} for _ in range(n)]
-
-    # Initialize the current part index
-    part_index = 0
-
-    # Initialize the current part count
-    current_count = 0
-
-    # Iterate over the sorted data
-    for year, count in sorted_data:
-        # If we've filled all parts except the last one, put remaining items in the last part
-        if part_index >= n - 1:
-            result[n - 1][year] = count
-            continue
-
-        # If adding the current data point would exceed the target count significantly,
-        # and we're not on the last part, move to the next part
-        if current_count + count > target_count * 1.1 and current_count > 0:
-            part_index += 1
-            current_count = 0
-
-        # Add the data point to the current part
-        result[part_index][year] = count
-        current_count += count
-
-        # If we've reached or exceeded the target count, consider moving to next part
-        if current_count >= target_count:
-            part_index += 1
-            current_count = 0
-
-    # Convert counts back to strings and sort keys
-    result = [{year: str(count) for year, count in sorted(part.items())} for part in result]
+    def deliver(req_no, scraper, future):
+        try:
+            search_results = future.result()
+        except Exception as e:
+            logger.error(
+                "Error fetching request %d for %s-%s: %s", req_no + 1, start_date, end_date, e, exc_info=True
+            )
+            search_results = None
+        page_queue.put((req_no, scraper, search_results))
 
-    return result
+    pending = deque()
+    try:
+        with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS, thread_name_prefix="page") as executor:
+            for req_no in req_numbers:
+                if stop.is_set():
+                    break
+                while True:
+                    try:
+                        scraper = scraper_pool.get_nowait()
+                        break
+                    except queue.Empty:
+                        if not pending:
+                            scraper = scraper_pool.get()
+                            break
+                        deliver(*pending.popleft())
+                if stop.is_set():
+                    scraper_pool.put(scraper)
+                    break
+
+                future = executor.submit(fetch_page, scraper, start_date, end_date, req_no)
+                pending.append((req_no, scraper, future))
+
+            while pending:
+                deliver(*pending.popleft())
+    finally:
+        page_queue.put(None)
 
 
 def main():
@@ -222,29 +416,51 @@ def main():
     server_no = args.server_no
 
     # Initialize Azure Blob Storage
-    azure_connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+    azure_connection_string = decode_env("AZURE_STORAGE_CONNECTION_STRING")
     container_name = os.getenv("AZURE_CONTAINER_NAME", "")
     if not azure_connection_string:
         logger.error("Missing AZURE_STORAGE_CONNECTION_STRING")
         raise ValueError("Azure Storage connection string not configured")
 
-    blob_service_client = BlobServiceClient.from_connection_string(azure_connection_string)
+    # Bounded connection pool for the storage account; the SDK pipeline does its own retries
+    azure_session = requests.Session()
+    azure_adapter = HTTPAdapter(pool_connections=AZURE_POOL_SIZE, pool_maxsize=AZURE_POOL_SIZE)
+    azure_session.mount("https://", azure_adapter)
+    azure_session.mount("http://", azure_adapter)
+    blob_service_client = BlobServiceClient.from_connection_string(
+        azure_connection_string,
+        transport=RequestsTransport(session=azure_session, session_owner=False),
+        max_block_size=AZURE_BLOCK_SIZE,
+        max_single_put_size=AZURE_BLOCK_SIZE,
+    )
+    container_client = blob_service_client.get_container_client(container_name)
 
     # Initialize MongoDB
-    mongodb_uri = os.getenv("MONGODB_URI", "")
-    mongodb_uri = re.sub(r"\\x3a", ":", mongodb_uri)
+    mongodb_uri = decode_env("MONGODB_URI", "")
     database_name = os.getenv("MONGODB_DATABASE", "")
     collection_name = os.getenv("MONGODB_COLLECTION", "")
 
     try:
         mongo_client = MongoClient(mongodb_uri)
         db = mongo_client[database_name]
-        collection = db[collection_name]
+        # Case documents are re-derivable from eCourts, so skip journal acknowledgement on writes
+        collection = db.get_collection(collection_name, write_concern=WriteConcern(w=1, j=False))
         logger.info("Connected to MongoDB")
     except ServerSelectionTimeoutError as e:
-        logger.error(f"Failed to connect to MongoDB: {str(e)}")
+        logger.error("Failed to connect to MongoDB: %s", e)
         raise
 
+    # Partial so documents written before case_id existed don't collide on a missing key
+    try:
+        collection.create_index(
+            "case_id", unique=True, partialFilterExpression={"case_id": {"$type": "string"}}, name="case_id_unique"
+        )
+    except PyMongoError as e:
+        logger.warning("Could not create unique case_id index, duplicates will not be rejected: %s", e)
+
+    mongo_writer = MongoWriter(collection)
+    seen_urls = SeenUrlStore(f"state_files/seen_urls_{STATE_CODE}.db")
+
     try:
         # Get or initialize state from local file
         state = load_state(STATE_CODE, server_no)
@@ -259,12 +475,12 @@ def main():
                 "current_batch": 0,
                 "completed": False,
                 "years": {},
-                "last_updated": datetime.now().isoformat(),
+                "last_updated": time(),
             }
-            save_state(state, server_no)
-            logger.info(f"Initialized new state for {STATE_CODE}")
+            save_state(state, server_no, force=True)
+            logger.info("Initialized new state for %s", STATE_CODE)
         else:
-            logger.info(f"Resuming from existing state for {STATE_CODE}")
+            logger.info("Resuming from existing state for %s", STATE_CODE)
 
         scraper = ECourtsScraper(STATE_CODE)
 
@@ -276,11 +492,15 @@ def main():
             # Fetching year data available for given court
             response = scraper.get_highcourt_year_data()
             if not response or not response.get("year_dtls"):
-                logger.warning(f"No results for years data")
+                logger.warning("No results for years data")
                 return
 
             years = extract_years_data(response["year_dtls"])
-            logger.info(f"Total years data available for given court: {len(years)}")
+            if not years:
+                # Unparseable year data: stop without saving it, so the run is neither skipped nor marked complete
+                logger.error("No years found in the year data for %s", STATE_CODE)
+                return
+            logger.info("Total years data available for given court: %d", len(years))
 
             # Ensure years is stored as a dictionary in state
             if isinstance(years, dict):
@@ -289,13 +509,11 @@ def main():
                 # If years is returned as a list, convert to dict (assuming format)
                 state["years"] = {str(year): "0" for year in years} if isinstance(years, list) else {}
 
-            state["last_updated"] = datetime.now().isoformat()
-            save_state(state, server_no)
+            state["last_updated"] = time()
+            save_state(state, server_no, force=True)
         else:
             years = state["years"]
-            logger.info(f"Using years from saved state: {years}")
-
-        del scraper
+            logger.info("Using years from saved state: %s", years)
 
         # Divide the years data based on server count
         divided_years = divide_data(years, server_count)
@@ -303,14 +521,33 @@ def main():
         # Get the years data for the current server
         if 1 <= server_no <= len(divided_years):
             years = divided_years[server_no - 1]
-            logger.info(f"Processing data for server {server_no} with years: {years}")
+            logger.info("Processing data for server %s with years: %s", server_no, years)
         else:
-            logger.error(f"Invalid server number: {server_no}. Must be between 1 and {len(divided_years)}")
+            logger.error("Invalid server number: %s. Must be between 1 and %d", server_no, len(divided_years))
             return
 
+        # One scraper per page that can be in flight: PAGE_PREFETCH queued plus the one being processed
+        scraper_pool = queue.Queue()
+        for _ in range(PAGE_PREFETCH + 1):
+            scraper_pool.put(ECourtsScraper(STATE_CODE, pool_maxsize=CASE_WORKERS))
+
         # Convert years dict to a sorted list of year keys for iteration
         years_list = sorted(years.keys(), reverse=True)  # Sort years in descending order
-        logger.info(f"Processing years: {years_list}")
+        logger.info("Processing years: %s", years_list)
+
+        # current_year_index points into this list, so progress saved for a different split of the years
+        # (another server count, or a state file older than server_years) can't be resumed
+        saved_years = state.get("server_years")
+        started = state["current_year_index"] or state["current_date_index"] or state["current_request"]
+        if saved_years != years_list and (saved_years is not None or started):
+            logger.error(
+                "State file for server %s was saved for years %s, not %s; remove it to start this server over",
+                server_no,
+                saved_years,
+                years_list,
+            )
+            return
+        state["server_years"] = years_list
 
         # Start processing from where we left off
         current_year_index = state["current_year_index"]
@@ -320,15 +557,15 @@ def main():
 
             # Update the current year index in state
             state["current_year_index"] = year_idx
-            state["last_updated"] = datetime.now().isoformat()
-            save_state(state, server_no)
+            state["last_updated"] = time()
+            save_state(state, server_no, force=True)
 
             # Debug logging
-            logger.info(f"Processing year {year} with {year_count} records (index {year_idx})")
+            logger.info("Processing year %s with %s records (index %d)", year, year_count, year_idx)
 
             # Generate date ranges for this year using the count from the dictionary
             date_ranges_in_a_year = get_all_dates_in_year(int(year), int(year_count))
-            logger.info(f"Generated {len(date_ranges_in_a_year)} dates for year {year}")
+            logger.info("Generated %d dates for year %s", len(date_ranges_in_a_year), year)
 
             # If we're continuing from a previous run, start from the saved date index
             start_date_idx = state["current_date_index"] if year_idx == current_year_index else 0
@@ -340,24 +577,24 @@ def main():
                 state["current_date_index"] = date_idx
                 state["current_request"] = 0  # Reset request counter for new date
                 state["current_batch"] = 0  # Reset batch counter for new date
-                state["last_updated"] = datetime.now().isoformat()
-                save_state(state, server_no)
+                state["last_updated"] = time()
+                save_state(state, server_no, force=True)
 
-                logger.info(f"Processing dates: {start_date}-{end_date}")
+                logger.info("Processing dates: %s-%s", start_date, end_date)
 
-                scraper = ECourtsScraper(STATE_CODE)
+                scraper.reset_session()
                 _ = scraper.search_cases()
 
                 search_results = scraper.search_cases(
                     from_date=start_date, to_date=end_date, display_length=DISPLAY_CASE
                 )
                 if not search_results or not search_results.get("reportrow"):
-                    logger.error(f"No search results returned for dates: {start_date}-{end_date}")
+                    logger.error("No search results returned for dates: %s-%s", start_date, end_date)
                     continue
 
                 total_records = int(search_results["reportrow"]["iTotalRecords"])
-                total_requests = math.ceil(total_records / DISPLAY_CASE)
-                logger.info(f"Total records: {total_records}, Total requests: {total_requests}")
+                total_requests = -(-total_records // DISPLAY_CASE)
+                logger.info("Total records: %d, Total requests: %d", total_records, total_requests)
 
                 # Start from the saved request number or from 0
                 start_req = (
@@ -366,87 +603,105 @@ def main():
                     else 0
                 )
 
-                del scraper
-
-                for req_no in range(start_req, total_requests):
-                    scraper = ECourtsScraper(STATE_CODE)
-                    _ = scraper.search_cases()
-
-                    # Update current request in state
-                    state["current_request"] = req_no
-                    state["current_batch"] = 0  # Reset batch counter for new request
-                    state["last_updated"] = datetime.now().isoformat()
-                    save_state(state, server_no)
-
-                    logger.info(f"Processing request {req_no + 1}/{total_requests}")
-
-                    start_from = req_no * DISPLAY_CASE
-                    # logger.info(f"Fetching results from index {start_from} with length {DISPLAY_CASE}")
-
-                    for i in range(req_no + 1):
-                        search_results = scraper.search_cases(
-                            from_date=start_date,
-                            to_date=end_date,
-                            start_from=i * DISPLAY_CASE,
-                            display_length=DISPLAY_CASE,
-                            page=i,
-                        )
-
-                    if not search_results or not search_results.get("reportrow"):
-                        logger.warning(f"No results for batch starting at {start_from}")
-                        continue
-
-                    data = search_results["reportrow"]["aaData"]
-                    logger.info(f"Retrieved {len(data)} results starting at index {start_from}")
-
-                    if data is None or scraper is None:
-                        continue
-
-                    # Process in batches with state tracking
-                    start_batch = state["current_batch"] if req_no == state["current_request"] else 0
-                    batch_count = (len(data) + BATCH_SIZE - 1) // BATCH_SIZE  # Calculate total batches
-
-                    for batch_idx in range(start_batch, batch_count):
-                        # Update batch index in state
-                        state["current_batch"] = batch_idx
-                        state["last_updated"] = datetime.now().isoformat()
-                        save_state(state, server_no)
-
-                        start_pos = batch_idx * BATCH_SIZE
-                        end_pos = min(start_pos + BATCH_SIZE, len(data))
-                        batch = data[start_pos:end_pos]
-
-                        logger.info(
-                            f"Processing batch {batch_idx + 1}/{batch_count}, items {start_pos} to {end_pos-1}"
-                        )
-                        process_case_batch(batch, scraper, blob_service_client, container_name, collection)
-
-                    del scraper
-
-                    sleep(1)
-
-                logger.info(f"Processed data of court {STATE_CODE} from {start_date} to {end_date}")
+                # Pages are fetched concurrently on a producer thread while the cases of earlier pages are processed here
+                page_queue = queue.Queue(maxsize=PAGE_PREFETCH)
+                stop_producer = threading.Event()
+                producer = threading.Thread(
+                    target=page_producer,
+                    args=(
+                        scraper_pool, page_queue, start_date, end_date, range(start_req, total_requests), stop_producer
+                    ),
+                    name="page-producer",
+                    daemon=True,
+                )
+                producer.start()
+
+                page = None
+                try:
+                    while (page := page_queue.get()) is not None:
+                        req_no, page_scraper, search_results = page
+                        try:
+                            # Update current request in state
+                            state["current_request"] = req_no
+                            state["current_batch"] = 0  # Reset batch counter for new request
+                            state["last_updated"] = time()
+                            save_state(state, server_no)
+
+                            logger.info("Processing request %d/%d", req_no + 1, total_requests)
+
+                            start_from = req_no * DISPLAY_CASE
+
+                            if not search_results or not search_results.get("reportrow"):
+                                logger.warning("No results for batch starting at %d", start_from)
+                                continue
+
+                            data = search_results["reportrow"]["aaData"]
+                            logger.info("Retrieved %d results starting at index %d", len(data), start_from)
+
+                            if data is None:
+                                continue
+
+                            # Process in batches with state tracking
+                            start_batch = state["current_batch"] if req_no == state["current_request"] else 0
+                            batch_count = (
+                                BATCH_COUNT_FULL if len(data) == DISPLAY_CASE else -(-len(data) // BATCH_SIZE)
+                            )  # Calculate total batches
+
+                            for batch_idx in range(start_batch, batch_count):
+                                # Tracked in memory only; resuming mid-date restarts at request granularity
+                                state["current_batch"] = batch_idx
+
+                                start_pos = batch_idx * BATCH_SIZE
+                                end_pos = min(start_pos + BATCH_SIZE, len(data))
+                                batch = data[start_pos:end_pos]
+
+                                logger.info(
+                                    "Processing batch %d/%d, items %d to %d",
+                                    batch_idx + 1,
+                                    batch_count,
+                                    start_pos,
+                                    end_pos - 1,
+                                )
+                                process_case_batch(batch, page_scraper, container_client, mongo_writer, seen_urls)
+                        finally:
+                            scraper_pool.put(page_scraper)
+                finally:
+                    if page is not None:
+                        # Processing failed mid-date: stop fetching, and return the scrapers of pages already fetched
+                        # so the producer is never left blocked on a full page queue or an empty scraper pool
+                        stop_producer.set()
+                        while (page := page_queue.get()) is not None:
+                            scraper_pool.put(page[1])
+                    producer.join()
+
+                mongo_writer.flush()
+                seen_urls.commit()
+                logger.info("Processed data of court %s from %s to %s", STATE_CODE, start_date, end_date)
 
             # Reset date index when moving to a new year
             state["current_date_index"] = 0
-            state["last_updated"] = datetime.now().isoformat()
-            save_state(state, server_no)
+            state["last_updated"] = time()
+            save_state(state, server_no, force=True)
 
-            logger.info(f"Processed data of court {STATE_CODE} of {year}")
+            logger.info("Processed data of court %s of %s", STATE_CODE, year)
 
         # Mark as completed
         state["completed"] = True
-        state["last_updated"] = datetime.now().isoformat()
-        save_state(state, server_no)
+        state["last_updated"] = time()
+        save_state(state, server_no, force=True)
 
         logger.info("Processing completed.")
 
     except Exception as e:
-        logger.error(f"Error in main processing loop: {str(e)}", exc_info=True)
+        logger.error("Error in main processing loop: %s", e, exc_info=True)
         # Log more details about the error
-        logger.error(f"Error type: {type(e)}")
-        logger.error(f"Error trace:", exc_info=True)
+        logger.error("Error type: %s", type(e))
+        logger.error("Error trace:", exc_info=True)
     finally:
+        _case_executor.shutdown(wait=True)
+        mongo_writer.close()
+        seen_urls.close()
+        azure_session.close()
         mongo_client.close()
         logger.info("MongoDB connection closed")
 
@@ -1,44 +1,58 @@
 import requests
-import json
 import time
 import os
-from bs4 import BeautifulSoup
 import re
 from urllib.parse import urljoin
 import uuid
 import logging
-from PIL import Image
+import queue
+import orjson
 from io import BytesIO
-from azure.cognitiveservices.vision.computervision import ComputerVisionClient
-from azure.cognitiveservices.vision.computervision.models import OperationStatusCodes
-from msrest.authentication import CognitiveServicesCredentials
-
 
+import atexit
+import operator
+import pickle
 import random
+import shutil
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import wraps
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from types import MappingProxyType
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from src.utils import decode_env, setup_logger
+
+# Optional local CAPTCHA OCR; without it CAPTCHAs are read with Azure Computer Vision
+try:
+    import ddddocr
+except ImportError:
+    ddddocr = None
 
 
-# Configure logging
-def setup_logger(name: str = "scraper", level: int = logging.INFO) -> logging.Logger:
-    logger = logging.getLogger(name)
-    if logger.handlers:
-        return logger
+# JSON decoder for response bodies; a module-level name so it can be swapped out
+_loads = orjson.loads
 
-    logger.setLevel(level)
-    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+# Read size for writing PDF downloads to disk
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
 
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+# Longest pause between PDF CAPTCHA attempts, in seconds
+PDF_CAPTCHA_MAX_DELAY = 5
 
-    os.makedirs("logs", exist_ok=True)
-    file_handler = logging.FileHandler(f'logs/scraper_{time.strftime("%Y%m%d")}.log')
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+# One {uuid: original file name} object per line, appended as judgments are downloaded
+FILENAME_MAPPINGS_FILE = "filename_mappings.jsonl"
+_mapping_file_lock = threading.Lock()
 
-    return logger
+# District lists barely change, so they are cached per state for a day
+DISTRICT_CACHE_DIR = os.path.join("cache", "districts")
+DISTRICT_CACHE_TTL = 24 * 60 * 60
+
+# app_token on the landing page: the hidden input's value, or an app_token= query in a script
+_TOKEN_RE = re.compile(rb"""<input[^>]*?\bid=["']app_token["'][^>]*?\bvalue=["']([^"']+)|app_token=([a-f0-9]+)""")
+_SCRIPT_TOKEN_RE = re.compile(r"app_token=([a-f0-9]+)")
 
 
 def rate_limit(min_delay=1, max_delay=3):
@@ -67,14 +81,18 @@ def retry_request(max_retries=3, retry_delay=2):
             for attempt in range(max_retries + 1):
                 try:
                     if attempt > 0:
-                        instance.logger.info(f"Retry attempt {attempt}/{max_retries}")
+                        instance.logger.info("Retry attempt %s/%s", attempt, max_retries)
                     return func(*args, **kwargs)
                 except RequestException as e:
                     last_exception = e
-                    instance.logger.warning(f"Request failed: {str(e)}, retrying in {retry_delay}s")
-                    time.sleep(retry_delay * (attempt + 1))  # Exponential backoff
-
-            instance.logger.error(f"Max retries exceeded. Last error: {str(last_exception)}")
+                    if attempt == max_retries:
+                        break
+                    # Jittered exponential backoff so threads that failed together don't retry in lockstep
+                    delay = min(60, random.uniform(retry_delay, retry_delay * 2**attempt))
+                    instance.logger.warning("Request failed: %s, retrying in %.1fs", e, delay)
+                    time.sleep(delay)
+
+            instance.logger.error("Max retries exceeded. Last error: %s", last_exception)
             raise last_exception
 
         return wrapper
@@ -82,13 +100,64 @@ def retry_request(max_retries=3, retry_delay=2):
     return decorator
 
 
+def retry_on_throttle(max_retries=5, max_delay=30):
+    """Decorator to retry a request when the server pushes back with 429 or 5xx, honouring Retry-After"""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            instance = args[0]
+            for attempt in range(max_retries + 1):
+                response = func(*args, **kwargs)
+                if (response.status_code != 429 and response.status_code < 500) or attempt == max_retries:
+                    return response
+
+                retry_after = response.headers.get("Retry-After", "")
+                delay = min(int(retry_after) if retry_after.isdigit() else 2**attempt, max_delay)
+                instance.logger.warning("Server returned %s, retrying in %ss", response.status_code, delay)
+                time.sleep(delay)
+
+        return wrapper
+
+    return decorator
+
+
+class TokenBucket:
+    """Thread-safe token bucket used as a soft ceiling on the request rate"""
+
+    def __init__(self, rate, capacity):
+        if rate <= 0 or capacity < 1:
+            raise ValueError(f"Token bucket needs a positive rate and a capacity of at least 1, got {rate}/{capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
 class ECourtsScraper:
     """Class to scrape judgments from the eCourts Judgments search website"""
 
-    BASE_URL = "https://judgments.ecourts.gov.in/pdfsearch/"
+    SITE_URL = "https://judgments.ecourts.gov.in/"
+    BASE_URL = SITE_URL + "pdfsearch/"
+    CAPTCHA_URL_PREFIX = BASE_URL + "vendor/securimage/securimage_show.php?"
     headers = {
         "Accept": "application/json, text/javascript, */*; q=0.01",
-        "Accept-Encoding": "gzip, deflate, br, zstd",
+        # Only the encodings urllib3 can actually decode here (br/zstd need brotli/zstandard installed)
+        "Accept-Encoding": ACCEPT_ENCODING,
         "Accept-Language": "en-US,en;q=0.9",
         "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
         "Origin": "https://judgments.ecourts.gov.in",
@@ -97,13 +166,207 @@ class ECourtsScraper:
         "X-Requested-With": "XMLHttpRequest",
     }
 
-    def __init__(self, state_code="", dist_code=""):
-        """Initialize with a session object to maintain cookies"""
-        self.logger = setup_logger()
+    # Per-request headers on top of the ones set on the session in __init__
+    xhr_headers = {
+        "Accept": "application/json, text/javascript, */*; q=0.01",
+        "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+        "Origin": "https://judgments.ecourts.gov.in",
+        "X-Requested-With": "XMLHttpRequest",
+    }
+    cors_headers = {
+        **xhr_headers,
+        "sec-ch-ua": '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
+        "sec-ch-ua-mobile": "?0",
+        "sec-ch-ua-platform": '"Linux"',
+        "Sec-Fetch-Dest": "empty",
+        "Sec-Fetch-Mode": "cors",
+        "Sec-Fetch-Site": "same-origin",
+    }
+    document_headers = {
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+        "sec-ch-ua": '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
+        "sec-ch-ua-mobile": "?0",
+        "sec-ch-ua-platform": '"Linux"',
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "same-origin",
+        "Upgrade-Insecure-Requests": "1",
+    }
+
+    # Form fields of a search request that never change; search_cases fills in the rest per call
+    _SEARCH_DEFAULTS = MappingProxyType(
+        {
+            "iColumns": "2",
+            "sColumns": ",",
+            "mDataProp_0": "0",
+            "sSearch_0": "",
+            "bRegex_0": "false",
+            "bSearchable_0": "true",
+            "bSortable_0": "true",
+            "mDataProp_1": "1",
+            "sSearch_1": "",
+            "bRegex_1": "false",
+            "bSearchable_1": "true",
+            "bSortable_1": "true",
+            "sSearch": "",
+            "bRegex": "false",
+            "iSortCol_0": "0",
+            "sSortDir_0": "asc",
+            "iSortingCols": "1",
+            "search_txt2": "",
+            "search_txt3": "",
+            "search_txt4": "",
+            "search_txt5": "",
+            "pet_res": "",
+            "state_code": "",
+            "case_no": "",
+            "case_year": "",
+            "judge_name": "",
+            "reg_year": "",
+            "fulltext_case_type": "",
+            "sel_search_by": "",
+            "sections": "",
+            "judge_txt": "",
+            "act_txt": "",
+            "section_txt": "",
+            "judge_val": "",
+            "act_val": "",
+            "year_val": "",
+            "judge_arr": "",
+            "flag": "",
+            "disp_nature": "",
+            "date_val": "ALL",
+            "citation_yr": "",
+            "citation_vol": "",
+            "citation_supl": "",
+            "citation_page": "",
+            "case_no1": "",
+            "case_year1": "",
+            "pet_res1": "",
+            "fulltext_case_type1": "",
+            "citation_keyword": "",
+            "proximity": "",
+            "sel_lang": "",
+            "neu_cit_year": "",
+            "neu_no": "",
+            "ajax_req": "true",
+            "int_fin_party_val": "undefined",
+            "int_fin_case_val": "undefined",
+            "int_fin_court_val": "undefined",
+            "int_fin_decision_val": "undefined",
+        }
+    )
+
+    # Form fields of the year-data request apart from the state and app_token
+    _YEAR_DATA_DEFAULTS = MappingProxyType(
+        {
+            "search_txt": "",
+            "iDisplayStart": "0",
+            "yearflg": "Y",
+            "search_txt1": "",
+            "search_txt2": "",
+            "search_txt3": "",
+            "search_txt4": "",
+            "search_txt5": "",
+            "pet_res": "",
+            "state_code": "",
+            "dist_code": "null",
+            "case_no": "",
+            "case_year": "",
+            "from_date": "",
+            "to_date": "",
+            "judge_name": "",
+            "reg_year": "",
+            "fulltext_case_type": "",
+            "int_fin_party_val": "undefined",
+            "int_fin_case_val": "undefined",
+            "int_fin_court_val": "undefined",
+            "int_fin_decision_val": "undefined",
+            "sel_search_by": "undefined",
+            "sections": "undefined",
+            "judge_txt": "",
+            "act_txt": "",
+            "section_txt": "",
+            "judge_val": "",
+            "act_val": "",
+            "year_val": "",
+            "judge_arr": "",
+            "flag": "",  # This replaces [object HTMLInputElement]
+            "captcha": "undefined",
+            "disp_nature": "",
+            "search_opt": "PHRASE",
+            "date_val": "ALL",
+            "fcourt_type": "2",
+            "citation_yr": "",
+            "citation_vol": "",
+            "citation_supl": "",
+            "citation_page": "",
+            "case_no1": "",
+            "case_year1": "",
+            "pet_res1": "",
+            "fulltext_case_type1": "",
+            "citation_keyword": "",
+            "sel_lang": "",
+            "proximity": "",
+            "neu_cit_year": "",
+            "neu_no": "",
+            "ajax_req": "true",
+        }
+    )
+
+    # CAPTCHA arithmetic: "<number><op><number>" once whitespace is removed
+    _EXPR_RE = re.compile(r"(\d+)([+\-*x/])(\d+)")
+    _OPS = {"+": operator.add, "-": operator.sub, "*": operator.mul, "x": operator.mul, "/": operator.truediv}
+    _STRIP_WHITESPACE = str.maketrans("", "", " \t\r\n")
+    # Answers are short alphanumeric strings; anything else is an OCR misread
+    _CAPTCHA_TEXT_RE = re.compile(r"[A-Za-z0-9]{4,8}")
+
+    # District data per state_code, shared by all scrapers in the process
+    _district_cache = {}
+
+    # The ddddocr model is expensive to load, so one instance is shared by all scrapers
+    _ocr = None
+    _ocr_lock = threading.Lock()
+
+    # Shared by all scraper instances so parallel workers respect one global rate (requests per second);
+    # every eCourts POST, including the per-case PDF requests, takes a token first. Built by the first
+    # scraper rather than at import, so ECOURTS_QPS/ECOURTS_BURST from a .env loaded after import apply
+    _rate_limiter = None
+    _rate_limiter_lock = threading.Lock()
+
+    def __init__(self, state_code="", dist_code="", pool_maxsize=64, session_file=None):
+        """Initialize with a session object to maintain cookies.
+
+        With session_file, a verified session saved by an earlier run is reused when it is still
+        accepted, and the session is saved back there at exit.
+        """
+        self.logger = setup_logger("scraper")
+        self.rate_limiter = self._get_rate_limiter()
         self.session = requests.Session()
+
+        # Pooled keep-alive connections are reused across session resets; size it to the number
+        # of threads sharing this scraper so none of them has to open a throwaway connection.
+        # Only GETs are retried on a bad status here: POSTs carry a one-shot app_token and are
+        # retried by retry_on_throttle in _post instead.
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_maxsize, max_retries=retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Headers every eCourts request shares; request-specific ones are still passed per call
+        self.session.headers.update(
+            {name: self.headers[name] for name in ("User-Agent", "Accept-Language", "Accept-Encoding", "Referer")}
+        )
+        self.session.headers["Connection"] = "keep-alive"
         self.app_token = None
         self.verified = False
-        self.state_code = state_code
+        self.state_code = str(state_code)
         self.dist_code = dist_code
 
         if state_code:
@@ -111,18 +374,40 @@ class ECourtsScraper:
         else:
             self.court_code = "1"
 
-        # Get Azure credentials from environment variables
-        subscription_key = os.getenv("COMPUTER_VISION_CLIENT_SUBSCRIPTION_KEY")
-        endpoint = os.getenv("COMPUTER_VISION_CLIENT_ENDPOINT")
+        # CAPTCHAs are read locally with ddddocr when it is installed, unless USE_AZURE_OCR asks for Azure
+        self.use_azure_ocr = ddddocr is None or bool(os.getenv("USE_AZURE_OCR"))
+        self.client = None
 
-        if not subscription_key or not endpoint:
-            self.logger.error(
-                "Missing Azure credentials. Please set COMPUTER_VISION_CLIENT_SUBSCRIPTION_KEY and COMPUTER_VISION_CLIENT_ENDPOINT environment variables."
-            )
-            raise ValueError("Azure credentials not configured properly")
+        if self.use_azure_ocr:
+            # The Azure SDK is slow to import, so it is only loaded when Azure OCR is actually used
+            from azure.cognitiveservices.vision.computervision import ComputerVisionClient
+            from msrest.authentication import CognitiveServicesCredentials
+
+            # Get Azure credentials from environment variables
+            subscription_key = os.getenv("COMPUTER_VISION_CLIENT_SUBSCRIPTION_KEY")
+            endpoint = decode_env("COMPUTER_VISION_CLIENT_ENDPOINT")
+
+            if not subscription_key or not endpoint:
+                self.logger.error(
+                    "Missing Azure credentials. Please set COMPUTER_VISION_CLIENT_SUBSCRIPTION_KEY and COMPUTER_VISION_CLIENT_ENDPOINT environment variables."
+                )
+                raise ValueError("Azure credentials not configured properly")
+
+            self.client = ComputerVisionClient(endpoint, CognitiveServicesCredentials(subscription_key))
+            # Keep msrest's HTTP session (and its TLS connection) open between OCR calls
+            self.client.config.keep_alive = True
 
-        self.client = ComputerVisionClient(endpoint, CognitiveServicesCredentials(subscription_key))
         self.max_captcha_attempts = 20
+        # app_token changes with every response, so token-carrying exchanges on this session run one at a time
+        self._token_lock = threading.Lock()
+        # Last PDF CAPTCHA answer the server accepted on this session
+        self._pdf_captcha = None
+
+        self.session_file = session_file
+        if session_file:
+            atexit.register(self.save_session)
+            if self.load_session():
+                return
         self.initialize_session()
 
     def initialize_session(self):
@@ -132,37 +417,91 @@ class ECourtsScraper:
             response = self.session.get(self.BASE_URL)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.content, "html.parser")
-            app_token_tag = soup.find("input", {"id": "app_token"})
-
-            if app_token_tag and app_token_tag.get("value"):
-                self.app_token = app_token_tag.get("value")
-                self.logger.info(f"Initial app_token acquired")
+            token_match = _TOKEN_RE.search(response.content)
+            if token_match:
+                self.app_token = (token_match.group(1) or token_match.group(2)).decode()
+                self.logger.info("Initial app_token acquired")
             else:
-                script_tags = soup.find_all("script")
-                for script in script_tags:
-                    if script.string and "app_token" in str(script.string):
-                        token_match = re.search(r"app_token=([a-f0-9]+)", str(script.string))
-                        if token_match:
-                            self.app_token = token_match.group(1)
-                            self.logger.info(f"Found app_token in script")
-                            break
+                # Markup the pattern does not cover (e.g. value before id); fall back to a full parse
+                from bs4 import BeautifulSoup
+
+                soup = BeautifulSoup(response.content, "html.parser")
+                app_token_tag = soup.find("input", {"id": "app_token"})
+
+                if app_token_tag and app_token_tag.get("value"):
+                    self.app_token = app_token_tag.get("value")
+                    self.logger.info("Initial app_token acquired")
+                else:
+                    script_tags = soup.find_all("script")
+                    for script in script_tags:
+                        if script.string and "app_token" in script.string:
+                            token_match = _SCRIPT_TOKEN_RE.search(script.string)
+                            if token_match:
+                                self.app_token = token_match.group(1)
+                                self.logger.info("Found app_token in script")
+                                break
 
             if not self.app_token:
                 self.logger.error("Failed to extract initial app_token")
                 # raise ValueError("Could not initialize session: No app_token found")
 
-            self.logger.debug(f"Current cookies: {self.session.cookies.get_dict()}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Current cookies: %s", self.session.cookies.get_dict())
 
         except Exception as e:
-            self.logger.error(f"Error initializing session: {str(e)}", exc_info=True)
+            self.logger.error("Error initializing session: %s", e, exc_info=True)
             raise
 
+    def reset_session(self):
+        """Start a fresh eCourts session (cookies, app_token, CAPTCHA) while keeping pooled connections"""
+        self.session.cookies.clear()
+        self.app_token = None
+        self.verified = False
+        self._pdf_captcha = None
+        self.initialize_session()
+
+    def save_session(self):
+        """Pickle the cookies and app_token of a verified session to session_file"""
+        if not self.session_file or not self.verified:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.session_file) or ".", exist_ok=True)
+            with open(self.session_file, "wb") as f:
+                pickle.dump({"cookies": self.session.cookies, "app_token": self.app_token}, f)
+            self.logger.info("Saved session to %s", self.session_file)
+        except Exception as e:
+            self.logger.warning("Could not save session to %s: %s", self.session_file, e)
+
+    def load_session(self):
+        """Restore a session saved by save_session and check it with a one-row search; True if it is usable"""
+        try:
+            with open(self.session_file, "rb") as f:
+                saved = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            self.logger.warning("Could not load session from %s: %s", self.session_file, e)
+            return False
+
+        self.session.cookies.update(saved["cookies"])
+        self.app_token = saved["app_token"]
+        self.verified = True
+        # Without re-seeding, so an expired session fails the check instead of being silently replaced
+        if self._search(self._search_data(display_length=1), reseed=False):
+            self.logger.info("Reusing saved session from %s", self.session_file)
+            return True
+
+        self.logger.info("Saved session in %s has expired", self.session_file)
+        self.session.cookies.clear()
+        self.app_token = None
+        self.verified = False
+        return False
+
     def verify(self):
         """Improved CAPTCHA verification with better error handling"""
         self.logger.info("Starting CAPTCHA verification process")
         for attempt in range(self.max_captcha_attempts):
-            self.logger.info(f"Verification attempt {attempt + 1}/{self.max_captcha_attempts}")
+            self.logger.info("Verification attempt %s/%s", attempt + 1, self.max_captcha_attempts)
 
             try:
                 # First, make sure our session is fresh
@@ -170,15 +509,19 @@ class ECourtsScraper:
                 #     self.initialize_session()
 
                 # Get and solve the CAPTCHA
-                if self.get_captcha():
-                    captcha_code = self.solve_captcha()
-
-                    if captcha_code and self.verify_captcha(captcha_code):
+                captcha_image = self.get_captcha()
+                if captcha_image:
+                    captcha_code = self.solve_captcha(captcha_image)
+                    if not captcha_code:
+                        # Unreadable CAPTCHA: skip the verification round trip and fetch a new one
+                        continue
+
+                    if self.verify_captcha(captcha_code):
                         self.verified = True
                         self.logger.info("CAPTCHA verification successful")
                         return True
                     else:
-                        self.logger.warning(f"CAPTCHA solution '{captcha_code}' was incorrect")
+                        self.logger.warning("CAPTCHA solution '%s' was incorrect", captcha_code)
                 else:
                     self.logger.warning("Failed to get CAPTCHA image")
 
@@ -186,96 +529,156 @@ class ECourtsScraper:
                 time.sleep(2 + attempt)
 
             except Exception as e:
-                self.logger.error(f"Error during CAPTCHA verification attempt: {str(e)}")
+                self.logger.error("Error during CAPTCHA verification attempt: %s", e)
                 time.sleep(3)
 
         self.logger.error("Failed to verify CAPTCHA after maximum attempts")
         raise ValueError("CAPTCHA verification failed")
 
+    @retry_on_throttle(max_retries=5)
+    def _post(self, url, reseed=True, **kwargs):
+        """POST to eCourts through the shared rate limiter, re-seeding the session once if it was rejected.
+
+        Every attempt, throttle retries included, sends the current app_token since each one is single-use.
+        """
+        self._refresh_token(kwargs)
+        self.rate_limiter.acquire()
+        response = self.session.post(url, **kwargs)
+        if response.status_code not in (401, 403) or not reseed:
+            return response
+
+        self.logger.warning("Session rejected with %s, re-seeding", response.status_code)
+        was_verified = self.verified
+        self.reset_session()
+        if was_verified:
+            self.verify()
+
+        self._refresh_token(kwargs)
+        self.rate_limiter.acquire()
+        return self.session.post(url, **kwargs)
+
+    def _refresh_token(self, kwargs):
+        """Put the current app_token into the form data of a pending POST"""
+        data = kwargs.get("data")
+        if isinstance(data, dict) and "app_token" in data:
+            kwargs["data"] = {**data, "app_token": self.app_token}
+
     def update_app_token(self, response_data):
         """Update app_token from response"""
         if isinstance(response_data, dict) and "app_token" in response_data:
             self.app_token = response_data["app_token"]
-            self.logger.debug(f"Updated app_token")
+            self.logger.debug("Updated app_token")
 
-    def get_captcha(self, url=None, save_path="captcha.png"):
-        """Get CAPTCHA image and save it to a file"""
+    def get_captcha(self, url=None):
+        """Get CAPTCHA image bytes, or None if it could not be fetched"""
         try:
             if not url:
-                captcha_url = urljoin(
-                    self.BASE_URL, f"vendor/securimage/securimage_show.php?{int(time.time() * 1000)}"
-                )
+                captcha_url = self.CAPTCHA_URL_PREFIX + str(int(time.time() * 1000))
             else:
                 captcha_url = urljoin(self.BASE_URL, url)
 
-            self.logger.info(f"Fetching CAPTCHA from {captcha_url}")
+            self.logger.info("Fetching CAPTCHA from %s", captcha_url)
 
+            # CAPTCHA images are a few KB, so read them whole and keep them in memory
             img_response = self.session.get(
                 captcha_url,
-                stream=True,
-                headers={"Referer": self.BASE_URL, "User-Agent": self.headers["User-Agent"]},
+                headers={"Referer": self.BASE_URL},
             )
             img_response.raise_for_status()
 
-            with open(save_path, "wb") as f:
-                for chunk in img_response.iter_content(1024):
-                    f.write(chunk)
-
-            self.logger.info(f"CAPTCHA image saved as {save_path}")
-            return True
+            self.logger.info("CAPTCHA image fetched (%d bytes)", len(img_response.content))
+            return img_response.content
 
         except Exception as e:
-            self.logger.error(f"Error getting CAPTCHA: {str(e)}", exc_info=True)
-            return False
+            self.logger.error("Error getting CAPTCHA: %s", e)
+            return None
 
     def solve_expression(self, text):
         """Solve a mathematical expression extracted from CAPTCHA."""
         try:
-            self.logger.debug(f"Solving expression: {text}")
-            text = text.strip().replace(" ", "")
-
-            operators = {
-                "+": lambda x, y: x + y,
-                "-": lambda x, y: x - y,
-                "*": lambda x, y: x * y,
-                "x": lambda x, y: x * y,
-                "/": lambda x, y: x / y,
-            }
-
-            for op, func in operators.items():
-                if op in text:
-                    operands = [int("".join(filter(str.isdigit, part))) for part in text.split(op)]
-                    if len(operands) == 2:
-                        result = func(operands[0], operands[1])
-                        self.logger.info(f"Solved: {operands[0]}{op}{operands[1]}={result}")
-                        return result
-                    raise ValueError(f"Invalid expression format: {text}")
+            self.logger.debug("Solving expression: %s", text)
+            text = text.translate(self._STRIP_WHITESPACE)
+
+            match = self._EXPR_RE.search(text)
+            if match:
+                left, op, right = match.groups()
+                result = self._OPS[op](int(left), int(right))
+                self.logger.info("Solved: %s%s%s=%s", left, op, right, result)
+                return result
 
             digits_only = "".join(filter(str.isdigit, text))
             if digits_only:
-                self.logger.warning(f"No operator found, returning digits: {digits_only}")
+                self.logger.warning("No operator found, returning digits: %s", digits_only)
                 return int(digits_only)
             raise ValueError(f"No valid operator found in expression: {text}")
 
         except Exception as e:
-            self.logger.error(f"Error evaluating expression '{text}': {str(e)}")
+            self.logger.error("Error evaluating expression '%s': %s", text, e)
             return f"Error evaluating expression: {str(e)}"
 
-    def solve_captcha(self, image_path="captcha.png"):
-        """Extract text from a CAPTCHA image using Azure OCR."""
+    @classmethod
+    def _get_rate_limiter(cls):
+        """Return the process-wide eCourts rate limiter, creating it from the environment on first use"""
+        with cls._rate_limiter_lock:
+            if cls._rate_limiter is None:
+                cls._rate_limiter = TokenBucket(
+                    rate=float(os.getenv("ECOURTS_QPS", "5")), capacity=int(os.getenv("ECOURTS_BURST", "5"))
+                )
+            return cls._rate_limiter
+
+    @classmethod
+    def _get_ocr(cls):
+        """Return the shared ddddocr instance, loading the model on first use"""
+        with cls._ocr_lock:
+            if cls._ocr is None:
+                cls._ocr = ddddocr.DdddOcr(show_ad=False)
+            return cls._ocr
+
+    def _plausible_captcha(self, text):
+        """Return OCR text without whitespace if it looks like a CAPTCHA answer, otherwise None"""
+        text = text.translate(self._STRIP_WHITESPACE)
+        if self._CAPTCHA_TEXT_RE.fullmatch(text):
+            return text
+        self.logger.warning("Discarding implausible CAPTCHA text: %r", text)
+        return None
+
+    def solve_captcha(self, image_bytes):
+        """Extract text from CAPTCHA image bytes using ddddocr, or Azure OCR when configured.
+
+        Returns None when the image could not be read or the text cannot be a CAPTCHA answer.
+        """
+        if not image_bytes:
+            return None
+
+        if not self.use_azure_ocr:
+            try:
+                text = self._get_ocr().classification(image_bytes)
+                self.logger.info("Extracted CAPTCHA text: %s", text)
+                return self._plausible_captcha(text)
+            except Exception as e:
+                self.logger.error("Error extracting text from image: %s", e)
+                return None
+
+        from azure.cognitiveservices.vision.computervision.models import OperationStatusCodes
+
+        # Azure Read statuses that mean the OCR result is not ready yet
+        pending = (OperationStatusCodes.running, OperationStatusCodes.not_started)
         try:
-            self.logger.info(f"Processing CAPTCHA image: {image_path}")
-            with open(image_path, "rb") as image_data:
-                read_response = self.client.read_in_stream(image_data, raw=True)
+            self.logger.info("Processing CAPTCHA image (%d bytes)", len(image_bytes))
+            read_response = self.client.read_in_stream(BytesIO(image_bytes), raw=True)
 
             operation_location = read_response.headers["Operation-Location"]
             operation_id = operation_location.split("/")[-1]
 
-            for _ in range(10):  # Max 10 seconds wait
+            # Poll quickly at first (reads usually finish in a few hundred ms), backing off up to 1s
+            delay = 0.1
+            deadline = time.monotonic() + 10  # Max 10 seconds wait
+            while True:
                 get_text_results = self.client.get_read_result(operation_id)
-                if get_text_results.status not in [OperationStatusCodes.running, OperationStatusCodes.not_started]:
+                if get_text_results.status not in pending or time.monotonic() >= deadline:
                     break
-                time.sleep(1)
+                time.sleep(delay)
+                delay = min(delay * 1.5, 1.0)
 
             if get_text_results.status == OperationStatusCodes.succeeded:
                 text = "\n".join(
@@ -283,16 +686,16 @@ class ECourtsScraper:
                     for page_result in get_text_results.analyze_result.read_results
                     for line in page_result.lines
                 )
-                self.logger.info(f"Extracted CAPTCHA text: {text}")
+                self.logger.info("Extracted CAPTCHA text: %s", text)
                 # return self.solve_expression(text.strip())
-                return text
+                return self._plausible_captcha(text)
 
-            self.logger.error(f"Text extraction failed with status: {get_text_results.status}")
-            return "Failed to read text from image"
+            self.logger.error("Text extraction failed with status: %s", get_text_results.status)
+            return None
 
         except Exception as e:
-            self.logger.error(f"Error extracting text from image: {str(e)}", exc_info=True)
-            return "Failed to read text from image"
+            self.logger.error("Error extracting text from image: %s", e)
+            return None
 
     def verify_captcha(self, captcha_solution):
         """Verify CAPTCHA solution"""
@@ -310,10 +713,11 @@ class ECourtsScraper:
             }
 
             self.logger.info("Verifying CAPTCHA")
-            response = self.session.post(url, headers=self.headers, data=data)
+            # A rejected session here is handled by the caller; re-seeding would recurse into verify()
+            response = self._post(url, reseed=False, headers=self.xhr_headers, data=data)
             response.raise_for_status()
 
-            result = response.json()
+            result = _loads(response.content)
             self.update_app_token(result)
 
             if result.get("captcha_status") == "Y":
@@ -324,7 +728,7 @@ class ECourtsScraper:
             return False
 
         except Exception as e:
-            self.logger.error(f"Error verifying CAPTCHA: {str(e)}", exc_info=True)
+            self.logger.error("Error verifying CAPTCHA: %s", e)
             return False
 
     # @rate_limit(min_delay=2, max_delay=5)
@@ -348,106 +752,218 @@ class ECourtsScraper:
             self.logger.error("Cannot proceed with search: CAPTCHA verification failed")
             return None
 
-        data = {
-            "sEcho": str(page),
-            "iColumns": "2",
-            "sColumns": ",",
-            "iDisplayStart": str(start_from),
-            "iDisplayLength": str(display_length),
-            "mDataProp_0": "0",
-            "sSearch_0": "",
-            "bRegex_0": "false",
-            "bSearchable_0": "true",
-            "bSortable_0": "true",
-            "mDataProp_1": "1",
-            "sSearch_1": "",
-            "bRegex_1": "false",
-            "bSearchable_1": "true",
-            "bSortable_1": "true",
-            "sSearch": "",
-            "bRegex": "false",
-            "iSortCol_0": "0",
-            "sSortDir_0": "asc",
-            "iSortingCols": "1",
-            "search_txt1": search_text,
-            "search_txt2": "",
-            "search_txt3": "",
-            "search_txt4": "",
-            "search_txt5": "",
-            "pet_res": "",
-            "state_code": "",
-            "state_code_li": self.state_code,
-            "dist_code": self.dist_code,
-            "case_no": "",
-            "case_year": "",
-            "from_date": from_date,
-            "to_date": to_date,
-            "judge_name": "",
-            "reg_year": "",
-            "fulltext_case_type": "",
-            "sel_search_by": "",
-            "sections": "",
-            "judge_txt": "",
-            "act_txt": "",
-            "section_txt": "",
-            "judge_val": "",
-            "act_val": "",
-            "year_val": "",
-            "judge_arr": "",
-            "flag": "",
-            "captcha": captcha_solution,
-            "disp_nature": "",
-            "search_opt": search_opt,
-            "date_val": "ALL",
-            "fcourt_type": self.court_code,
-            "citation_yr": "",
-            "citation_vol": "",
-            "citation_supl": "",
-            "citation_page": "",
-            "case_no1": "",
-            "case_year1": "",
-            "pet_res1": "",
-            "fulltext_case_type1": "",
-            "citation_keyword": "",
-            "proximity": "",
-            "sel_lang": "",
-            "neu_cit_year": "",
-            "neu_no": "",
-            "ajax_req": "true",
-            "app_token": self.app_token,
-            "int_fin_party_val": "undefined",
-            "int_fin_case_val": "undefined",
-            "int_fin_court_val": "undefined",
-            "int_fin_decision_val": "undefined",
-        }
+        return self._search(
+            self._search_data(
+                page, search_text, captcha_solution, display_length, start_from, search_opt, from_date, to_date
+            )
+        )
 
+    def _search_data(
+        self,
+        page="1",
+        search_text="",
+        captcha_solution="",
+        display_length=100,
+        start_from=0,
+        search_opt="PHRASE",
+        from_date="",
+        to_date="",
+    ):
+        """Build the form data of a search request"""
+        data = dict(self._SEARCH_DEFAULTS)
+        data.update(
+            {
+                "sEcho": str(page),
+                "iDisplayStart": str(start_from),
+                "iDisplayLength": str(display_length),
+                "search_txt1": search_text,
+                "state_code_li": self.state_code,
+                "dist_code": self.dist_code,
+                "from_date": from_date,
+                "to_date": to_date,
+                "captcha": captcha_solution,
+                "search_opt": search_opt,
+                "fcourt_type": self.court_code,
+                "app_token": self.app_token,
+            }
+        )
+        return data
+
+    def _search(self, data, reseed=True):
+        """Run a search with prepared form data, returning the result or None"""
         try:
             search_url = f"{self.BASE_URL}?p=pdf_search/home"
-            self.logger.info(f"Executing search with text: {search_text}")
-            response = self.session.post(search_url, headers=self.headers, data=data)
+            self.logger.info("Executing search with text: %s", data["search_txt1"])
+            response = self._post(search_url, reseed=reseed, headers=self.xhr_headers, data=data)
             response.raise_for_status()
 
-            result = response.json()
+            result = _loads(response.content)
             self.update_app_token(result)
 
             if "reportrow" in result:
-                self.logger.info(f"Search returned {len(result['reportrow'])} results")
+                self.logger.info("Search returned %d results", len(result["reportrow"]))
                 return result
 
             self.logger.warning("No search results found")
             return None
 
         except Exception as e:
-            self.logger.error(f"Error during search: {str(e)}", exc_info=True)
+            self.logger.error("Error during search: %s", e, exc_info=True)
             return None
 
+    def iter_cases(self, display_length=1000, **search_kwargs):
+        """Yield result rows across every page of a search, keeping only the current page in memory.
+
+        Pages of display_length rows are requested in turn; the default trades fewer round trips against
+        holding a larger page. page is the DataTables draw counter, numbered from 1 as in search_cases.
+        """
+        start_from = 0
+        page = 1
+        while True:
+            result = self.search_cases(page=page, start_from=start_from, display_length=display_length, **search_kwargs)
+            rows = result["reportrow"].get("aaData") if result else None
+            if not rows:
+                return
+            total = int(result["reportrow"].get("iTotalRecords", 0))
+            del result
+
+            yield from rows
+            start_from += len(rows)
+            page += 1
+            if len(rows) < display_length or start_from >= total:
+                return
+
+    def _pdf_captcha_backoff(self, attempt):
+        """Back off between PDF CAPTCHA attempts without holding the token lock the caller took"""
+        self._token_lock.release()
+        try:
+            time.sleep(min(2 + attempt, PDF_CAPTCHA_MAX_DELAY))
+        finally:
+            self._token_lock.acquire()
+
+    def _request_pdf_url(self, pdf_detail):
+        """Ask eCourts for the downloadable URL of a judgment PDF, solving the PDF CAPTCHA if required.
+
+        Must be called with the token lock held; it is released while backing off between CAPTCHA attempts.
+        """
+        val, path = pdf_detail
+        path = path.replace("&search=%20", "")
+
+        pdf_info_url = "https://judgments.ecourts.gov.in/pdfsearch/?p=pdf_search/openpdfcaptcha"
+        path_with_params = (
+            f"{path}#page=&search=+&citation_year=&fcourt_type=2&file_type=undefined&nc_display=undefined"
+        )
+
+        data = {
+            "val": val,
+            "lang_flg": "undefined",
+            "path": path_with_params,
+            "ajax_req": "true",
+            "app_token": self.app_token,
+        }
+
+        if "__session:0.8998627207867523:" not in self.session.cookies:
+            self.session.cookies.set("__session:0.8998627207867523:", "https:")
+
+        self.logger.debug("Requesting PDF: %s", path)
+        pdf_info_response = self._post(pdf_info_url, headers=self.cors_headers, data=data)
+        pdf_info_response.raise_for_status()
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("PDF info response: %s", pdf_info_response.text)
+
+        try:
+            pdf_info_result = _loads(pdf_info_response.content)
+            self.update_app_token(pdf_info_result)
+
+            # Check if the response contains 'filename' which indicates captcha is needed
+            if "filename" in pdf_info_result:
+
+                # The server may still accept the last answer it took, so try that before solving a new CAPTCHA;
+                # that try counts as one of the bounded attempts
+                captcha_code = self._pdf_captcha
+                for attempt in range(self.max_captcha_attempts):
+                    reused = bool(captcha_code)
+                    if not reused:
+                        self.logger.info(
+                            "Captcha required, solving captcha (attempt %s/%s)...",
+                            attempt + 1,
+                            self.max_captcha_attempts,
+                        )
+                        captcha_code = self.solve_captcha(self.get_captcha())
+                        if not captcha_code:
+                            self._pdf_captcha_backoff(attempt)
+                            continue
+
+                    # Create new data for captcha request
+                    captcha_data = {
+                        "val": val,
+                        "captcha1": captcha_code,
+                        "lang_flg": "undefined",
+                        "path": path_with_params,
+                        "ajax_req": "true",
+                        "app_token": self.app_token,
+                    }
+
+                    # Make the second request with captcha to get the PDF
+                    pdf_info_url = "https://judgments.ecourts.gov.in/pdfsearch/?p=pdf_search/openpdf"
+                    pdf_info_response = self._post(pdf_info_url, headers=self.cors_headers, data=captcha_data)
+                    pdf_info_response.raise_for_status()
+
+                    pdf_info_result = _loads(pdf_info_response.content)
+                    self.update_app_token(pdf_info_result)
+
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug("Captcha response: %s", pdf_info_response.text)
+
+                    if "invalid" in (pdf_info_result.get("message") or "").lower():
+                        captcha_code = None
+                        if reused:
+                            # The remembered answer has expired; forget it and solve a fresh one straight away
+                            self._pdf_captcha = None
+                        else:
+                            self._pdf_captcha_backoff(attempt)
+                        continue
+                    else:
+                        self._pdf_captcha = captcha_code
+                        break
+                else:
+                    self.logger.error("Failed to solve the PDF CAPTCHA after %s attempts", self.max_captcha_attempts)
+                    return None
+
+            if "outputfile" in pdf_info_result:
+                output_file = pdf_info_result["outputfile"]
+                if output_file.startswith(("http://", "https://")):
+                    return output_file
+                return self.SITE_URL + output_file.lstrip("/")
+
+            self.logger.error("PDF download failed: %s", pdf_info_result.get("errormsg", "No error message provided"))
+            return None
+
+        except orjson.JSONDecodeError:
+            self.logger.error("Invalid JSON response: %s", pdf_info_response.text[:200])
+            return None
+
+    def _get_pdf_response(self, pdf_url):
+        """Open a streaming GET for a resolved PDF URL"""
+        self.logger.debug("Downloading PDF from: %s", pdf_url)
+
+        pdf_response = self.session.get(pdf_url, stream=True, headers=self.document_headers)
+        pdf_response.raise_for_status()
+        return pdf_response
+
+    def _record_filename_mapping(self, output_dir, unique_id, original_filename):
+        """Remember which eCourts file a UUID-named download came from, appending it to the JSONL sidecar"""
+        line = orjson.dumps({unique_id: original_filename}) + b"\n"
+        with _mapping_file_lock, open(os.path.join(output_dir, FILENAME_MAPPINGS_FILE), "ab") as f:
+            f.write(line)
+
     # @rate_limit(min_delay=0.5, max_delay=2)
     # @retry_request(max_retries=3)
     def download_judgment(self, pdf_detail, val="0", citation_year="", output_dir="judgments"):
-        """Download a judgment PDF file with UUID filename"""
+        """Download a judgment PDF file with UUID filename, returning (local_path, file_name) or None"""
         try:
-            val, path = pdf_detail
-            path = path.replace("&search=%20", "")
+            path = pdf_detail[1].replace("&search=%20", "")
 
             os.makedirs(output_dir, exist_ok=True)
 
@@ -457,145 +973,56 @@ class ECourtsScraper:
                 original_filename += ".pdf"
 
             # Generate UUID for the new filename
-            unique_id = str(uuid.uuid4())
-            uuid_filename = f"{unique_id}.pdf"
+            unique_id = uuid.uuid4().hex
+            uuid_filename = unique_id + ".pdf"
             output_path = os.path.join(output_dir, uuid_filename)
 
-            # Create a mapping file to store original filename and UUID mapping
-            mapping_file = os.path.join(output_dir, "filename_mappings.json")
-            mapping_data = {}
-
-            # Load existing mappings if file exists
-            if os.path.exists(mapping_file):
-                try:
-                    with open(mapping_file, "r") as f:
-                        mapping_data = json.load(f)
-                except json.JSONDecodeError:
-                    self.logger.error("Error reading mapping file, creating new one")
-                    mapping_data = {}
-
-            pdf_info_url = "https://judgments.ecourts.gov.in/pdfsearch/?p=pdf_search/openpdfcaptcha"
-            path_with_params = (
-                f"{path}#page=&search=+&citation_year=&fcourt_type=2&file_type=undefined&nc_display=undefined"
-            )
-
-            data = {
-                "val": val,
-                "lang_flg": "undefined",
-                "path": path_with_params,
-                "ajax_req": "true",
-                "app_token": self.app_token,
-            }
-
-            pdf_headers = {
-                "Accept": "application/json, text/javascript, */*; q=0.01",
-                "Accept-Encoding": "gzip, deflate, br, zstd",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Connection": "keep-alive",
-                "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-                "Origin": "https://judgments.ecourts.gov.in",
-                "Referer": "https://judgments.ecourts.gov.in/",
-                "sec-ch-ua": '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
-                "sec-ch-ua-mobile": "?0",
-                "sec-ch-ua-platform": '"Linux"',
-                "Sec-Fetch-Dest": "empty",
-                "Sec-Fetch-Mode": "cors",
-                "Sec-Fetch-Site": "same-origin",
-                "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
-                "X-Requested-With": "XMLHttpRequest",
-            }
-
-            if "__session:0.8998627207867523:" not in self.session.cookies:
-                self.session.cookies.set("__session:0.8998627207867523:", "https:")
+            with self._token_lock:
+                pdf_url = self._request_pdf_url(pdf_detail)
+            if not pdf_url:
+                return None
 
-            self.logger.info(f"Requesting PDF: {path}")
-            pdf_info_response = self.session.post(pdf_info_url, headers=pdf_headers, data=data)
-            pdf_info_response.raise_for_status()
+            pdf_response = self._get_pdf_response(pdf_url)
 
-            print(pdf_info_response.text)
+            # Copy straight from the decoded socket stream in large blocks
+            pdf_response.raw.decode_content = True
+            with pdf_response, open(output_path, "wb") as f:
+                shutil.copyfileobj(pdf_response.raw, f, DOWNLOAD_CHUNK_SIZE)
 
-            try:
-                pdf_info_result = pdf_info_response.json()
-                self.update_app_token(pdf_info_result)
-
-                # Check if the response contains 'filename' which indicates captcha is needed
-                if "filename" in pdf_info_result:
-
-                    while True:
-                        self.logger.info("Captcha required, solving captcha...")
-                        self.get_captcha()
-                        captcha_code = self.solve_captcha()
-
-                        # Create new data for captcha request
-                        captcha_data = {
-                            "val": val,
-                            "captcha1": captcha_code,
-                            "lang_flg": "undefined",
-                            "path": path_with_params,
-                            "ajax_req": "true",
-                            "app_token": self.app_token,
-                        }
-
-                        # Make the second request with captcha to get the PDF
-                        pdf_info_url = "https://judgments.ecourts.gov.in/pdfsearch/?p=pdf_search/openpdf"
-                        pdf_info_response = self.session.post(pdf_info_url, headers=pdf_headers, data=captcha_data)
-                        pdf_info_response.raise_for_status()
-
-                        pdf_info_result = pdf_info_response.json()
-                        self.update_app_token(pdf_info_result)
-
-                        print("Captcha response:")
-                        print(pdf_info_response.text)
-
-                        if "invalid" in pdf_info_result["message"].lower():
-                            continue
-                        else:
-                            break
-
-                if "outputfile" in pdf_info_result:
-                    pdf_url = urljoin("https://judgments.ecourts.gov.in/", pdf_info_result["outputfile"])
-                    self.logger.info(f"Downloading PDF from: {pdf_url}")
-
-                    pdf_download_headers = {
-                        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-                        "Accept-Encoding": "gzip, deflate, br, zstd",
-                        "Accept-Language": "en-US,en;q=0.9",
-                        "Connection": "keep-alive",
-                        "Referer": "https://judgments.ecourts.gov.in/",
-                        "sec-ch-ua": '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
-                        "sec-ch-ua-mobile": "?0",
-                        "sec-ch-ua-platform": '"Linux"',
-                        "Sec-Fetch-Dest": "document",
-                        "Sec-Fetch-Mode": "navigate",
-                        "Sec-Fetch-Site": "same-origin",
-                        "Upgrade-Insecure-Requests": "1",
-                        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
-                    }
+            self._record_filename_mapping(output_dir, unique_id, original_filename)
+            self.logger.debug("Successfully downloaded PDF to %s (UUID: %s)", output_path, unique_id)
+            return output_path, uuid_filename
 
-                    pdf_response = self.session.get(pdf_url, stream=True, headers=pdf_download_headers)
-                    pdf_response.raise_for_status()
-
-                    with open(output_path, "wb") as f:
-                        for chunk in pdf_response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
+        except Exception as e:
+            self.logger.error("Error downloading judgment: %s", e, exc_info=True)
+            return None
 
-                    self.logger.info(f"Successfully downloaded PDF to {output_path} (UUID: {unique_id})")
-                    return output_path
+    def download_judgment_stream(self, pdf_detail):
+        """Open a judgment PDF as a streaming response so it can be uploaded without a local copy.
 
-                self.logger.error(
-                    f"PDF download failed: {pdf_info_result.get('errormsg', 'No error message provided')}"
-                )
+        The caller owns the returned response and must close it.
+        """
+        try:
+            with self._token_lock:
+                pdf_url = self._request_pdf_url(pdf_detail)
+            if not pdf_url:
                 return None
 
-            except json.JSONDecodeError:
-                self.logger.error(f"Invalid JSON response: {pdf_info_response.text[:200]}")
-                return None
+            pdf_response = self._get_pdf_response(pdf_url)
+            pdf_response.raw.decode_content = True
+            return pdf_response
 
         except Exception as e:
-            self.logger.error(f"Error downloading judgment: {str(e)}", exc_info=True)
+            self.logger.error("Error streaming judgment: %s", e, exc_info=True)
             return None
 
+    def bulk_download_judgments(self, pdf_details, output_dir="judgments", max_workers=8):
+        """Download several judgments concurrently, returning download_judgment results in input order"""
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf") as executor:
+            return list(
+                executor.map(lambda pdf_detail: self.download_judgment(pdf_detail, output_dir=output_dir), pdf_details)
+            )
+
     def _get_current_timestamp(self):
         """Helper method to get current timestamp in ISO format"""
         from datetime import datetime
@@ -603,118 +1030,92 @@ class ECourtsScraper:
         return datetime.now().isoformat()
 
     def get_district_data(self):
-        """Get district data for a state"""
+        """Get district data for a state, served from the in-memory or on-disk cache when fresh"""
+        cached = self._district_cache.get(self.state_code)
+        if cached is not None:
+            return cached
+
+        cache_file = os.path.join(DISTRICT_CACHE_DIR, f"{self.state_code}.json")
+        try:
+            if time.time() - os.path.getmtime(cache_file) < DISTRICT_CACHE_TTL:
+                with open(cache_file, "rb") as f:
+                    result = _loads(f.read())
+                self._district_cache[self.state_code] = result
+                self.logger.info("Loaded district data for state %s from cache", self.state_code)
+                return result
+        except (OSError, orjson.JSONDecodeError):
+            pass
+
         try:
             url = f"{self.BASE_URL}?p=pdf_search/get_distData"
             data = {"state_code": self.state_code, "ajax_req": "true", "app_token": self.app_token}
 
-            self.logger.info(f"Fetching district data for state: {self.state_code}")
-            response = self.session.post(url, headers=self.headers, data=data)
+            self.logger.info("Fetching district data for state: %s", self.state_code)
+            response = self._post(url, headers=self.xhr_headers, data=data)
             response.raise_for_status()
 
-            result = response.json()
+            result = _loads(response.content)
             self.update_app_token(result)
-            self.logger.info(f"Successfully retrieved district data")
+            self.logger.info("Successfully retrieved district data")
+
+            # The app_token is single-use, so it is not part of what gets cached
+            result.pop("app_token", None)
+            self._district_cache[self.state_code] = result
+            try:
+                os.makedirs(DISTRICT_CACHE_DIR, exist_ok=True)
+                with open(cache_file, "wb") as f:
+                    f.write(orjson.dumps(result))
+            except OSError as e:
+                self.logger.warning("Could not write district cache %s: %s", cache_file, e)
             return result
 
         except Exception as e:
-            self.logger.error(f"Error getting district data: {str(e)}", exc_info=True)
+            self.logger.error("Error getting district data: %s", e, exc_info=True)
             return None
 
     def get_highcourt_year_data(self):
-
-        headers = {
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding": "gzip, deflate, br, zstd",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Connection": "keep-alive",
-            "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "Host": "judgments.ecourts.gov.in",
-            "Origin": "https://judgments.ecourts.gov.in",
-            "Referer": "https://judgments.ecourts.gov.in/",
-            "sec-ch-ua": '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
-            "sec-ch-ua-mobile": "?0",
-            "sec-ch-ua-platform": '"Linux"',
-            "Sec-Fetch-Dest": "empty",
-            "Sec-Fetch-Mode": "cors",
-            "Sec-Fetch-Site": "same-origin",
-            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
-            "X-Requested-With": "XMLHttpRequest",
-        }
-
         try:
             url = f"{self.BASE_URL}?p=pdf_search/home/nocaptcha/fetchyear/"
 
-            data = {
-                "search_txt": "",
-                "iDisplayStart": "0",
-                "yearflg": "Y",
-                "search_txt1": "",
-                "search_txt2": "",
-                "search_txt3": "",
-                "search_txt4": "",
-                "search_txt5": "",
-                "pet_res": "",
-                "state_code": "",
-                "state_code_li": str(self.state_code),
-                "dist_code": "null",
-                "case_no": "",
-                "case_year": "",
-                "from_date": "",
-                "to_date": "",
-                "judge_name": "",
-                "reg_year": "",
-                "fulltext_case_type": "",
-                "int_fin_party_val": "undefined",
-                "int_fin_case_val": "undefined",
-                "int_fin_court_val": "undefined",
-                "int_fin_decision_val": "undefined",
-                "sel_search_by": "undefined",
-                "sections": "undefined",
-                "judge_txt": "",
-                "act_txt": "",
-                "section_txt": "",
-                "judge_val": "",
-                "act_val": "",
-                "year_val": "",
-                "judge_arr": "",
-                "flag": "",  # This replaces [object HTMLInputElement]
-                "captcha": "undefined",
-                "disp_nature": "",
-                "search_opt": "PHRASE",
-                "date_val": "ALL",
-                "fcourt_type": "2",
-                "citation_yr": "",
-                "citation_vol": "",
-                "citation_supl": "",
-                "citation_page": "",
-                "case_no1": "",
-                "case_year1": "",
-                "pet_res1": "",
-                "fulltext_case_type1": "",
-                "citation_keyword": "",
-                "sel_lang": "",
-                "proximity": "",
-                "neu_cit_year": "",
-                "neu_no": "",
-                "ajax_req": "true",
-                "app_token": self.app_token,
-            }
+            data = {**self._YEAR_DATA_DEFAULTS, "state_code_li": self.state_code, "app_token": self.app_token}
 
-            self.logger.info(f"Fetching year data for given high court: {self.state_code}")
-            response = self.session.post(url, headers=headers, data=data)
+            self.logger.info("Fetching year data for given high court: %s", self.state_code)
+            response = self._post(url, headers=self.cors_headers, data=data)
             response.raise_for_status()
 
-            result = response.json()
+            result = _loads(response.content)
             self.update_app_token(result)
 
             if "year_dtls" in result:
-                self.logger.info(f"Fetched year data for given high court")
+                self.logger.info("Fetched year data for given high court")
                 return result
 
             self.logger.warning("No search results found")
             return None
 
         except Exception as e:
-            self.logger.error(f"Error getting year data: {str(e)}", exc_info=True)
+            self.logger.error("Error getting year data: %s", e, exc_info=True)
             return None
+
+
+def search_many(scrapers, queries):
+    """Run search_cases for each query (a dict of keyword arguments) across a pool of scrapers.
+
+    Each scraper carries its own app_token chain, so it serves one query at a time; independent
+    queries run in parallel on different scrapers. Yields (query, result) pairs as they complete.
+    """
+    pool = queue.Queue()
+    for scraper in scrapers:
+        pool.put(scraper)
+
+    def run(query):
+        scraper = pool.get()
+        try:
+            return scraper.search_cases(**query)
+        finally:
+            pool.put(scraper)
+
+    with ThreadPoolExecutor(max_workers=len(scrapers), thread_name_prefix="search") as executor:
+        futures = {executor.submit(run, query): query for query in queries}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
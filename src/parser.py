@@ -1,252 +1,372 @@
+import hashlib
+import html
 import logging
 import re
-from typing import Dict, Optional, Any, List, Union
-from bs4 import BeautifulSoup, Tag, NavigableString
-
-
-# Configure logging
-def setup_logger(name: str = "parser", level: int = logging.INFO) -> logging.Logger:
-    """Set up and return a configured logger instance"""
-    logger = logging.getLogger(name)
-
-    if logger.handlers:
-        return logger
-
-    logger.setLevel(level)
-    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
-
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-
-    try:
-        import os
-
-        os.makedirs("logs", exist_ok=True)
-        file_handler = logging.FileHandler(f'logs/parser_{__import__("time").strftime("%Y%m%d")}.log')
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    except Exception as e:
-        logger.warning(f"Failed to create file handler: {e}")
-
-    return logger
-
-
-logger = setup_logger()
-
-
-def extract_pdf_info_from_button(onclick_attr: str) -> Optional[tuple[str, str]]:
+import sys
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Any, List, Tuple
+from bs4 import BeautifulSoup, PageElement, Tag
+
+from src.utils import setup_logger
+
+
+logger = setup_logger("parser")
+
+# Patterns used per row, compiled once
+# One pass over an open_pdf(...) call: the three-argument form
+# open_pdf('0','','court/cnrorders/dhcdb/orders/DLHC010281202025_1_2025-05-08.pdf#page=') gives id and path,
+# otherwise any quoted .pdf argument gives the path alone
+_OPEN_PDF_RE = re.compile(
+    r"open_pdf\s*\("
+    r"(?:\s*['\"](?P<id>[^'\"]*)['\"]?\s*,\s*['\"][^'\"]*['\"]?\s*,\s*['\"](?P<path>[^'\"]+)['\"]"
+    r"|.*?['\"](?P<pdf>[^'\"]+\.pdf[^'\"]*)['\"])"
+)
+_PDF_URL_RE = re.compile(r"(?P<pdf>https?://[^'\"]+\.pdf[^'\"]*)")
+_WS_RE = re.compile(r"\s+")
+_YEAR_RE = re.compile(r"(\d{4})")
+_CASE_RE = re.compile(r"([a-zA-Z\s]+)\s+(\d+)(?:\s+of\s+|\s+)(\d{4})")
+_JUDGE_RE = re.compile(r"(?:Judge|Hon\'ble|Justice)[:\s]+([^:]+)", re.IGNORECASE)
+_KV_RE = re.compile(r"([^:|]+):\s*([^|]+)")
+_DATE_RE = re.compile(r"(\d{2}-\d{2}-\d{4})")
+# "<case type/number/year> of <title>", split on the first standalone "of"
+_HEADING_OF_RE = re.compile(r"^(.*?)\s+of\s+(.+)$", re.IGNORECASE | re.DOTALL)
+# Markup patterns for reading well-formed rows without building a tree
+# Inside a start tag: anything up to ">", where quoted attribute values may themselves contain ">"
+_TAG_BODY = r"""(?:[^>"']|"[^"]*"|'[^']*')*"""
+_BUTTON_RE = re.compile(rf"<button\b({_TAG_BODY})>(.*?)</button>", re.IGNORECASE | re.DOTALL)
+_STRONG_RE = re.compile(rf"<strong\b{_TAG_BODY}>(.*?)</strong>", re.IGNORECASE | re.DOTALL)
+_ATTR_RE = re.compile(r"""([^\s"'=<>/]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?""")
+_TAG_RE = re.compile(rf"<{_TAG_BODY}>")
+# Markup the regexes can't read the way a parser would: comments, raw-text elements and the judgment-id attribute
+_NEEDS_PARSE_RE = re.compile(r"<!--|<(?:script|style|textarea)\b|data-judgment-id", re.IGNORECASE)
+_NESTED_STRONG_RE = re.compile(r"<strong\b", re.IGNORECASE)
+
+
+def extract_pdf_info_from_button(onclick_attr: str) -> Tuple[Optional[str], Optional[str]]:
     """Extract the PDF ID and path from the button's onclick attribute
 
     Returns:
-        Optional tuple of (pdf_id, pdf_path) or None if extraction fails
+        Tuple of (pdf_id, pdf_path); pdf_id is None when only the path is known, both are None if extraction fails
     """
     if not onclick_attr:
         logger.warning("Empty onclick attribute provided")
         return None, None
 
-    # Pattern for the format: open_pdf('0','','court/cnrorders/dhcdb/orders/DLHC010281202025_1_2025-05-08.pdf#page=')
-    new_pattern = r"open_pdf\s*\(\s*['\"]([^'\"]*)['\"]?\s*,\s*['\"]([^'\"]*)['\"]?\s*,\s*['\"]([^'\"]+)['\"]"
-    match = re.search(new_pattern, onclick_attr)
+    match = _OPEN_PDF_RE.search(onclick_attr)
 
-    if match:
-        pdf_id = match.group(1).strip()
-        # Skipping the second group as it's empty in your example
-        pdf_path = match.group(3).strip()
-        logger.debug(f"Extracted PDF ID: {pdf_id}, PDF path: {pdf_path[:50]}...")
+    if match and match.group("path"):
+        pdf_id = match.group("id").strip()
+        pdf_path = match.group("path").strip()
+        logger.debug("Extracted PDF ID: %s, PDF path: %.50s...", pdf_id, pdf_path)
         return pdf_id, pdf_path
 
-    # Fallback to previous patterns if the new pattern doesn't match
-    patterns = [
-        r"open_pdf\('(\d+)',\s*'',\s*'([^']+)'",
-        r"open_pdf\(.*?['\"]([^'\"]+\.pdf[^'\"]*)['\"]",
-        r"(https?://[^'\"]+\.pdf[^'\"]*)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, onclick_attr)
-        if match:
-            if pattern == patterns[0]:
-                # This pattern captures both ID and path
-                pdf_id = match.group(1).strip()
-                pdf_path = match.group(2).strip()
-                return pdf_id, pdf_path
-            else:
-                # These patterns only capture the path
-                pdf_path = match.group(1).strip()
-                logger.debug(f"Extracted PDF path only: {pdf_path[:50]}...")
-                return None, pdf_path
+    # Fall back to a bare .pdf argument or URL, which only give the path
+    if match or (match := _PDF_URL_RE.search(onclick_attr)):
+        pdf_path = match.group("pdf").strip()
+        logger.debug("Extracted PDF path only: %.50s...", pdf_path)
+        return None, pdf_path
 
-    logger.warning(f"Failed to extract PDF info from onclick: {onclick_attr[:100]}...")
+    logger.warning("Failed to extract PDF info from onclick: %.100s...", onclick_attr)
     return None, None
 
 
-def safe_text_extraction(element: Union[Tag, NavigableString, None]) -> str:
+def safe_text_extraction(element: Optional[PageElement]) -> str:
     """Safely extract text from a BeautifulSoup element"""
     if element is None:
         return ""
     try:
         return element.text.strip()
     except Exception as e:
-        logger.warning(f"Error extracting text: {e}")
+        logger.warning("Error extracting text: %s", e)
         return ""
 
 
+@lru_cache(maxsize=4096)
 def normalize_text(text: str) -> str:
     """Normalize text by removing extra whitespace and converting to lowercase"""
     if not text:
         return ""
-    return re.sub(r"\s+", " ", text.strip()).lower()
+    # str.split() drops leading/trailing whitespace and splits on the same characters as \s+
+    return " ".join(text.split()).lower()
+
+
+@dataclass(slots=True)
+class CaseDetail:
+    """Parsed judgment row; the common fields are slots and anything else goes to extra"""
+
+    url: Any = None
+    title: Optional[str] = None
+    case_type: Optional[str] = None
+    case_number: Optional[str] = None
+    year: Optional[str] = None
+    judge: Optional[str] = None
+    court: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, name: str, value: Any) -> None:
+        """Set a field by name, falling back to extra for fields without a slot"""
+        if name in _CASE_DETAIL_FIELDS:
+            setattr(self, name, value)
+        else:
+            # Field names come from the page and repeat on every row, so one copy of each is shared
+            self.extra[sys.intern(name)] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Flatten into the document shape stored in MongoDB, leaving out unset fields"""
+        data = {name: value for name in _CASE_DETAIL_FIELDS if (value := getattr(self, name)) is not None}
+        data.update(self.extra)
+        return data
 
 
-def case_details_parser(res: str) -> Dict[str, Any]:
-    """Parse case details from HTML string"""
-    data = {}
-    logger.info("Parsing case details")
+_CASE_DETAIL_FIELDS = ("url", "title", "case_type", "case_number", "year", "judge", "court")
+# Low-cardinality fields whose values are interned so rows share one string per distinct value
+_CATEGORICAL_FIELDS = ("case_type", "year", "court")
+
+
+def parse_case_detail(res: str) -> CaseDetail:
+    """Parse case details from HTML string into a CaseDetail"""
+    detail = CaseDetail()
+    logger.debug("Parsing case details")
 
     if not res or not isinstance(res, str):
         logger.error("Invalid input: empty or non-string input")
-        return data
+        return detail
 
     try:
-        soup = BeautifulSoup(res, "html.parser")
+        soup = BeautifulSoup(res, "lxml")
 
         # Extract URL
         pdf_path = extract_pdf_info_from_button(res)
         if pdf_path:
-            data["url"] = pdf_path
+            detail.url = pdf_path
+
+        # Collect the button, the first strong (judge) and the caseDetailsTD strong in one walk of the tree
+        button: Optional[Tag] = None
+        judge_element: Optional[Tag] = None
+        case_details_elem: Optional[Tag] = None
+        for element in soup.find_all(["button", "strong"]):
+            if not isinstance(element, Tag):
+                continue
+            if element.name == "button":
+                if button is None:
+                    button = element
+            else:
+                if judge_element is None:
+                    judge_element = element
+                if case_details_elem is None and "caseDetailsTD" in (element.get("class") or ()):
+                    case_details_elem = element
 
         # Parse button for case details
-        button = soup.find("button")
         if button:
             heading_text = safe_text_extraction(button)
 
-            if "of" in heading_text:
-                parts = heading_text.split("of", 1)
-                if len(parts) > 1:
-                    data["title"] = normalize_text(parts[1])
+            if heading_match := _HEADING_OF_RE.match(heading_text):
+                prefix, suffix = heading_match.groups()
+                detail.title = normalize_text(suffix)
 
-                if parts[0].strip():
-                    case_details = parts[0].strip()
+                if prefix.strip():
+                    case_details = prefix.strip()
                     details_parts = case_details.split("/")
                     if len(details_parts) >= 3:
-                        data["case_type"], data["case_number"], data["year"] = map(normalize_text, details_parts[:3])
+                        detail.case_type, detail.case_number, detail.year = map(normalize_text, details_parts[:3])
                     elif len(details_parts) == 2:
-                        data["case_type"] = normalize_text(details_parts[0])
+                        detail.case_type = normalize_text(details_parts[0])
                         number_year = details_parts[1].strip()
-                        year_match = re.search(r"(\d{4})", number_year)
+                        year_match = _YEAR_RE.search(number_year)
                         if year_match:
-                            data["year"] = year_match.group(1)
-                            data["case_number"] = normalize_text(number_year[: year_match.start()])
+                            detail.year = year_match.group(1)
+                            detail.case_number = normalize_text(number_year[: year_match.start()])
                         else:
-                            data["case_number"] = normalize_text(number_year)
+                            detail.case_number = normalize_text(number_year)
                     else:
-                        case_match = re.search(r"([a-zA-Z\s]+)\s+(\d+)(?:\s+of\s+|\s+)(\d{4})", case_details)
+                        case_match = _CASE_RE.search(case_details)
                         if case_match:
-                            data["case_type"], data["case_number"], data["year"] = map(
+                            detail.case_type, detail.case_number, detail.year = map(
                                 normalize_text, case_match.groups()
                             )
                         else:
-                            data["raw_details"] = normalize_text(case_details)
+                            detail.extra["raw_details"] = normalize_text(case_details)
             else:
-                data["raw_heading"] = normalize_text(heading_text)
+                detail.extra["raw_heading"] = normalize_text(heading_text)
 
         # Extract judge name
-        judge_element = soup.find("strong")
         if judge_element:
             judge_text = safe_text_extraction(judge_element)
-            judge_match = re.search(r"(?:Judge|Hon\'ble|Justice)[:\s]+([^:]+)", judge_text, re.IGNORECASE)
-            data["judge"] = normalize_text(judge_match.group(1) if judge_match else judge_text.replace("Judge :", ""))
+            judge_match = _JUDGE_RE.search(judge_text)
+            detail.judge = normalize_text(judge_match.group(1) if judge_match else judge_text.replace("Judge :", ""))
 
         # Extract other case details
-        case_details_elem = soup.find("strong", class_="caseDetailsTD")
         if case_details_elem:
             fields = case_details_elem.find_all("span")
             values = case_details_elem.find_all("font")
 
-            for field, value in zip(fields, values):
-                field_name = normalize_text(safe_text_extraction(field).replace("|", "").replace(":", ""))
+            for field_elem, value in zip(fields, values):
+                field_name = normalize_text(safe_text_extraction(field_elem).replace("|", "").replace(":", ""))
                 if field_name:
-                    data[field_name] = normalize_text(safe_text_extraction(value))
+                    detail.set(field_name, normalize_text(safe_text_extraction(value)))
 
             if not fields or not values:
                 raw_details = safe_text_extraction(case_details_elem)
-                data["raw_case_details"] = normalize_text(raw_details)
-                for field, value in re.findall(r"([^:|]+):\s*([^|]+)", raw_details):
-                    data[normalize_text(field)] = normalize_text(value)
+                detail.extra["raw_case_details"] = normalize_text(raw_details)
+                for field_text, value in _KV_RE.findall(raw_details):
+                    detail.set(normalize_text(field_text), normalize_text(value))
+
+        for name in _CATEGORICAL_FIELDS:
+            if value := getattr(detail, name):
+                setattr(detail, name, sys.intern(value))
 
         # Add metadata
-        data["_metadata"] = {
+        fields_extracted = len(detail.to_dict())
+        detail.extra["_metadata"] = {
             "parser_version": "2.1",
             "raw_html_length": len(res),
-            "fields_extracted": len(data),
-            "timestamp": __import__("time").time(),
-            "is_complete": not bool(
-                [f for f in ["url", "title", "case_type", "case_number", "year"] if f not in data]
+            "fields_extracted": fields_extracted,
+            "timestamp": time.time(),
+            "is_complete": all(
+                getattr(detail, f) is not None for f in ("url", "title", "case_type", "case_number", "year")
             ),
         }
 
-        logger.info(f"Parsed case details with {len(data)} fields")
-        return data
+        logger.debug("Parsed case details with %d fields", fields_extracted + 1)
+        return detail
 
     except Exception as e:
-        logger.error(f"Error parsing case details: {str(e)}", exc_info=True)
-        data["_error"] = str(e)
-        return data
+        logger.error("Error parsing case details: %s", e, exc_info=True)
+        detail.extra["_error"] = str(e)
+        return detail
+
+
+def case_details_parser(res: str) -> Dict[str, Any]:
+    """Parse case details from HTML string"""
+    return parse_case_detail(res).to_dict()
+
+
+def _build_judgment_metadata(
+    onclick: Optional[str],
+    judgment_id: Optional[str],
+    button_text: str,
+    judgment_date: Optional[str],
+    judge_text: str,
+) -> Dict[str, Any]:
+    """Turn the raw pieces of a judgment row into its metadata dict"""
+    metadata: Dict[str, Any] = {}
+
+    if onclick is not None:
+        if pdf_path := extract_pdf_info_from_button(onclick):
+            metadata["pdf_url"] = pdf_path
+
+    if judgment_id is not None:
+        metadata["judgment_id"] = judgment_id
+
+    if heading_match := _HEADING_OF_RE.match(button_text):
+        prefix, suffix = heading_match.groups()
+        metadata["title"] = normalize_text(suffix)
+        if prefix.strip():
+            case_details = prefix.strip().split("/")
+            if len(case_details) >= 3:
+                metadata["case_type"], metadata["case_number"], metadata["year"] = map(normalize_text, case_details[:3])
+
+    if judgment_date:
+        metadata["judgment_date"] = judgment_date
+
+    if "Judge :" in judge_text:
+        metadata["judge"] = normalize_text(judge_text.replace("Judge :", ""))
+
+    return metadata
+
+
+def _markup_text(fragment: str) -> str:
+    """Text content of an HTML fragment, as element.text.strip() would give it"""
+    return html.unescape(_TAG_RE.sub("", fragment)).strip()
+
+
+def _extract_judgment_metadata_fast(html_row: str) -> Optional[Dict[str, Any]]:
+    """Read judgment metadata straight from the row markup, or return None when the row needs a full parse"""
+    if _NEEDS_PARSE_RE.search(html_row):
+        return None
+    button_match = _BUTTON_RE.search(html_row)
+    strong_match = _STRONG_RE.search(html_row)
+    if not button_match or not strong_match or _NESTED_STRONG_RE.search(strong_match.group(1)):
+        return None
+
+    button_attrs, button_html = button_match.groups()
+    # The first occurrence of an attribute wins, as in the HTML parsers
+    attrs: Dict[str, str] = {}
+    for name, double_quoted, single_quoted, unquoted in _ATTR_RE.findall(button_attrs):
+        attrs.setdefault(name.lower(), double_quoted or single_quoted or unquoted)
+    onclick = attrs.get("onclick")
+    if not onclick:
+        return None
+    # Only the displayed text, so a date inside an onclick path or href can't win
+    date_match = _DATE_RE.search(_TAG_RE.sub(" ", html_row))
+
+    return _build_judgment_metadata(
+        html.unescape(onclick),
+        None,
+        _markup_text(button_html),
+        date_match.group(1) if date_match else None,
+        _markup_text(strong_match.group(1)),
+    )
+
+
+def _extract_judgment_metadata_soup(html_row: str) -> Dict[str, Any]:
+    """Read judgment metadata from a full BeautifulSoup parse of the row"""
+    soup = BeautifulSoup(html_row, "lxml")
+
+    button = soup.find("button")
+    if not isinstance(button, Tag):
+        button = None
+    onclick = button.get("onclick") if button else None
+    id_element = soup.select_one("[data-judgment-id]")
+    judgment_id = id_element.get("data-judgment-id") if id_element else None
+
+    # The date is matched on the row with its tags stripped, as in the fast path
+    date_match = _DATE_RE.search(_TAG_RE.sub(" ", html_row))
+
+    judge_elem = soup.find("strong")
+    if not isinstance(judge_elem, Tag):
+        judge_elem = None
+    return _build_judgment_metadata(
+        onclick if isinstance(onclick, str) else None,
+        judgment_id if isinstance(judgment_id, str) else None,
+        safe_text_extraction(button) if button else "",
+        date_match.group(1) if date_match else None,
+        safe_text_extraction(judge_elem) if judge_elem else "",
+    )
 
 
 def extract_judgment_metadata(html_row: str) -> Dict[str, Any]:
     """Extract metadata from judgment HTML row"""
-    metadata = {}
-    logger.info("Extracting judgment metadata")
+    metadata: Dict[str, Any] = {}
+    logger.debug("Extracting judgment metadata")
 
     if not html_row or not isinstance(html_row, str):
         logger.error("Invalid input: empty or non-string HTML row")
         return metadata
 
     try:
-        soup = BeautifulSoup(html_row, "html.parser")
-
-        button = soup.find("button")
-        if button and "onclick" in button.attrs:
-            if pdf_path := extract_pdf_info_from_button(button["onclick"]):
-                metadata["pdf_url"] = pdf_path
+        # Rows with a button and a strong are read with regexes; anything else gets a full parse
+        fast_metadata = _extract_judgment_metadata_fast(html_row)
+        metadata = fast_metadata if fast_metadata is not None else _extract_judgment_metadata_soup(html_row)
 
-        if id_element := soup.find(attrs={"data-judgment-id": True}):
-            metadata["judgment_id"] = id_element["data-judgment-id"]
-
-        if button:
-            button_text = safe_text_extraction(button)
-            if "of" in button_text:
-                parts = button_text.split("of", 1)
-                if len(parts) > 1:
-                    metadata["title"] = normalize_text(parts[1])
-                if parts[0].strip():
-                    case_details = parts[0].strip().split("/")
-                    if len(case_details) >= 3:
-                        metadata["case_type"], metadata["case_number"], metadata["year"] = map(
-                            normalize_text, case_details[:3]
-                        )
-
-        if date_elem := soup.find(text=re.compile(r"\d{2}-\d{2}-\d{4}")):
-            if date_match := re.search(r"(\d{2}-\d{2}-\d{4})", str(date_elem)):
-                metadata["judgment_date"] = date_match.group(1)
-
-        if judge_elem := soup.find("strong"):
-            judge_text = safe_text_extraction(judge_elem)
-            if "Judge :" in judge_text:
-                metadata["judge"] = normalize_text(judge_text.replace("Judge :", ""))
-
-        logger.info(f"Extracted metadata with {len(metadata)} fields")
+        logger.debug("Extracted metadata with %d fields", len(metadata))
         return metadata
 
     except Exception as e:
-        logger.error(f"Error extracting metadata: {str(e)}", exc_info=True)
+        logger.error("Error extracting metadata: %s", e, exc_info=True)
         return {"_error": str(e)}
 
 
-def parse_search_results(search_results: Dict[str, Any]) -> Dict[str, Any]:
-    """Parse search results into structured judgment data"""
+def parse_search_results(
+    search_results: Dict[str, Any], executor: Optional[Executor] = None, *, keep_raw: bool = False
+) -> Dict[str, Any]:
+    """Parse search results into structured judgment data, spreading rows over executor when one is given
+
+    Short rows are kept verbatim as _raw_html only when keep_raw is set; otherwise each row gets a hash to trace it by.
+    """
     parsed_results = []
     logger.info("Parsing search results")
 
@@ -256,26 +376,32 @@ def parse_search_results(search_results: Dict[str, Any]) -> Dict[str, Any]:
 
     try:
         rows = search_results.get("reportrow", [])
-        logger.info(f"Found {len(rows)} judgment rows")
+        logger.info("Found %d judgment rows", len(rows))
+
+        # Rows parse independently, so they can all be submitted up front and collected in order
+        futures = [executor.submit(case_details_parser, row[0]) if row else None for row in rows] if executor else None
 
         for i, row in enumerate(rows):
             try:
                 if not row:
-                    logger.warning(f"Empty row at index {i}")
+                    logger.warning("Empty row at index %d", i)
                     continue
 
-                judgment_data = case_details_parser(row[0])
+                future = futures[i] if futures else None
+                judgment_data = future.result() if future is not None else case_details_parser(row[0])
                 judgment_data["_row_index"] = i
-                if len(row[0]) < 1000:
+                if keep_raw and len(row[0]) < 1000:
                     judgment_data["_raw_html"] = row[0]
+                else:
+                    judgment_data["_raw_html_sha1"] = hashlib.sha1(row[0].encode()).hexdigest()[:12]
 
                 parsed_results.append(judgment_data)
 
                 if (i + 1) % 20 == 0 or i + 1 == len(rows):
-                    logger.info(f"Progress: {i+1}/{len(rows)} rows parsed")
+                    logger.info("Progress: %d/%d rows parsed", i + 1, len(rows))
 
             except Exception as e:
-                logger.error(f"Error parsing row {i+1}: {str(e)}", exc_info=True)
+                logger.error("Error parsing row %d: %s", i + 1, e, exc_info=True)
                 parsed_results.append({"_row_index": i, "_error": str(e), "_parsing_failed": True})
 
         metadata = {
@@ -283,40 +409,49 @@ def parse_search_results(search_results: Dict[str, Any]) -> Dict[str, Any]:
             "successful_parses": sum(1 for r in parsed_results if not r.get("_parsing_failed", False)),
             "failed_parses": sum(1 for r in parsed_results if r.get("_parsing_failed", False)),
             "parser_version": "2.1",
-            "timestamp": __import__("time").time(),
+            "timestamp": time.time(),
         }
 
-        logger.info(f"Parsed {len(parsed_results)}/{len(rows)} rows")
+        logger.info("Parsed %d/%d rows", len(parsed_results), len(rows))
         return {"judgments": parsed_results, "metadata": metadata}
 
     except Exception as e:
-        logger.error(f"Error parsing search results: {str(e)}", exc_info=True)
+        logger.error("Error parsing search results: %s", e, exc_info=True)
         return {"judgments": [], "metadata": {"error": str(e)}}
 
 
-def batch_process_judgments(judgments: List[Dict[str, Any]], processor_func: callable) -> List[Dict[str, Any]]:
-    """Process a batch of judgments with a custom processor function"""
+def batch_process_judgments(
+    judgments: List[Dict[str, Any]],
+    processor_func: Callable[[Dict[str, Any]], Dict[str, Any]],
+    executor: Optional[Executor] = None,
+) -> List[Dict[str, Any]]:
+    """Process a batch of judgments with a custom processor function, on executor when one is given"""
     results = []
-    logger.info(f"Batch processing {len(judgments)} judgments")
+    logger.info("Batch processing %d judgments", len(judgments))
+
+    futures = [executor.submit(processor_func, judgment) for judgment in judgments] if executor else None
 
     for i, judgment in enumerate(judgments):
         try:
-            results.append(processor_func(judgment))
+            results.append(futures[i].result() if futures else processor_func(judgment))
             if (i + 1) % 10 == 0 or i + 1 == len(judgments):
-                logger.info(f"Progress: {i+1}/{len(judgments)} judgments processed")
+                logger.info("Progress: %d/%d judgments processed", i + 1, len(judgments))
         except Exception as e:
-            logger.error(f"Error processing judgment {i+1}: {str(e)}", exc_info=True)
+            logger.error("Error processing judgment %d: %s", i + 1, e, exc_info=True)
             judgment["_processing_error"] = str(e)
             results.append(judgment)
 
     return results
 
 
-def extract_years_data(html: str):
-    soup = BeautifulSoup(html, "html.parser")
-    elements = soup.find("div", class_="modal-body").find_all("a")
+def extract_years_data(years_html: str) -> Dict[str, str]:
+    soup = BeautifulSoup(years_html, "html.parser")
+    modal_body = soup.find("div", class_="modal-body")
+    if not isinstance(modal_body, Tag):
+        logger.warning("No modal-body in year data; treating it as no years")
+        return {}
     data = {}
-    for ele in elements:
-        year, count = re.split(r"\s+", ele.text)
+    for ele in modal_body.find_all("a"):
+        year, count = _WS_RE.split(ele.text)
         data[year] = count
     return data
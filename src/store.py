@@ -0,0 +1,44 @@
+import os
+import sqlite3
+import threading
+
+
+class SeenUrlStore:
+    """SQLite-backed record of eCourts PDF paths that were already uploaded to Azure"""
+
+    def __init__(self, path, commit_every=1000):
+        """Open (or create) the store; writes are committed in groups of commit_every rows"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS seen_urls (url TEXT PRIMARY KEY, blob_url TEXT)")
+        self.commit_every = commit_every
+        self.uncommitted = 0
+        self.lock = threading.Lock()
+
+    def get(self, url):
+        """Return the blob URL a PDF path was uploaded to, or None if it was never seen"""
+        with self.lock:
+            row = self.conn.execute("SELECT blob_url FROM seen_urls WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def add(self, url, blob_url):
+        """Remember that a PDF path was uploaded to blob_url"""
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO seen_urls (url, blob_url) VALUES (?, ?)", (url, blob_url))
+            self.uncommitted += 1
+            if self.uncommitted >= self.commit_every:
+                self.conn.commit()
+                self.uncommitted = 0
+
+    def commit(self):
+        """Commit any pending rows"""
+        with self.lock:
+            self.conn.commit()
+            self.uncommitted = 0
+
+    def close(self):
+        """Commit pending rows and close the database"""
+        self.commit()
+        self.conn.close()
@@ -1,48 +1,101 @@
+import atexit
+import logging
 import math
-from datetime import datetime, timedelta
+import os
+import queue
+import re
+import time
+from bisect import bisect_left
+from datetime import date
+from functools import lru_cache
+from itertools import accumulate
+from logging.handlers import QueueHandler, QueueListener
 
 
-def get_all_dates_in_year(year, total_count):
-    """Generate date ranges in the specified year based on gap days."""
-    add_variable = date_gap(total_count)
+_ESCAPED_COLON_RE = re.compile(r"\\x3[aA]")
 
-    # Start with January 1st of the given year
-    start_date = datetime(year, 1, 1)
+_LOG_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
 
-    # End date is December 31st of the given year
-    end_date = datetime(year, 12, 31)
 
-    # List to store date range tuples
-    date_ranges = []
+def log_level(default):
+    """Level for a logger defaulting to default: LOG_LEVEL (e.g. WARNING in production) may raise it, never lower it"""
+    level = logging.getLevelName(os.getenv("LOG_LEVEL", "").strip().upper())
+    # getLevelName maps unknown names to a "Level ..." string rather than raising
+    return max(default, level) if isinstance(level, int) else default
 
-    # Special case: if add_variable is -1, return entire year as one range
-    if add_variable == -1:
-        date_ranges.append((start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")))
-        return date_ranges
 
-    current_start = start_date
+@lru_cache(maxsize=None)
+def _file_handler(path):
+    """Shared handler for a log file; the file is only opened once something is written to it"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    file_handler = logging.FileHandler(path, delay=True)
+    file_handler.setFormatter(_LOG_FORMATTER)
+    return file_handler
+
+
+def setup_logger(name, level=logging.INFO):
+    """Return logger name, logging to the console and to the day's logs/<name>_YYYYMMDD.log.
+
+    Worker threads only enqueue records; a background listener does the console/file I/O.
+    """
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(log_level(level))
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(_LOG_FORMATTER)
+    handlers = [console_handler]
+    file_handler_error = None
+
+    try:
+        handlers.append(_file_handler(os.path.join("logs", f"{name}_{time.strftime('%Y%m%d')}.log")))
+    except Exception as e:
+        file_handler_error = e
 
-    while current_start <= end_date:
-        # Calculate the end of current range
-        range_end = current_start + timedelta(days=add_variable - 1)
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
 
-        # Ensure we don't exceed the year boundary
-        if range_end > end_date:
-            range_end = end_date
+    if file_handler_error:
+        logger.warning("Failed to create file handler: %s", file_handler_error)
 
-        # Add the date range tuple (start_date, end_date)
-        date_ranges.append((current_start.strftime("%Y-%m-%d"), range_end.strftime("%Y-%m-%d")))
+    return logger
 
-        # Move to the next range start (day after current range end)
-        current_start = range_end + timedelta(days=1)
 
-        # Break if we've reached or exceeded the year end
-        if current_start > end_date:
-            break
+def decode_env(name, default=None):
+    """Read an environment variable, decoding the escaped colons some deploy tools write as \\x3a"""
+    value = os.environ.get(name, default)
+    if value is None or "\\x3" not in value:
+        return value
+    return _ESCAPED_COLON_RE.sub(":", value)
 
-    return date_ranges
+
+@lru_cache(maxsize=32)
+def get_all_dates_in_year(year, total_count):
+    """Generate date ranges in the specified year based on gap days, as a cached tuple."""
+    add_variable = date_gap(total_count)
+
+    # Work on day ordinals so each range costs two date objects instead of repeated timedelta arithmetic
+    start_day = date(year, 1, 1).toordinal()
+    end_day = date(year, 12, 31).toordinal()
+    from_ordinal = date.fromordinal
+
+    # Special case: if add_variable is -1, return entire year as one range
+    if add_variable == -1:
+        return ((from_ordinal(start_day).isoformat(), from_ordinal(end_day).isoformat()),)
+
+    # Each range spans add_variable days, with the last one clipped to the year end
+    return tuple(
+        (from_ordinal(day).isoformat(), from_ordinal(min(day + add_variable - 1, end_day)).isoformat())
+        for day in range(start_day, end_day + 1, add_variable)
+    )
 
 
+@lru_cache(maxsize=128)
 def date_gap(total_count):
     effective_judgement_days = 365 - (2 * 4 * 12)
     avg_judgement_per_day = total_count / effective_judgement_days
@@ -58,6 +111,50 @@ def date_gap(total_count):
         return gap_days
 
 
+def divide_data(data, n):
+    """
+    Divides the input data (year: count) into n parts with approximately equal counts.
+    Each year appears in only one part with its actual count.
+
+    Args:
+        data (dict): A dictionary where keys are years (strings) and values are counts (strings).
+        n (int): The number of parts to divide the data into.
+
+    Returns:
+        list: A list of n dictionaries, where each dictionary represents a part of the data.
+              Each part contains a subset of the original data with approximately equal counts.
+
+    Raises:
+        ValueError: If n is not positive.
+    """
+    if n <= 0:
+        raise ValueError(f"Cannot divide data into {n} parts")
+
+    # Sort the data by year, keeping counts as integers
+    sorted_data = sorted((year, int(count)) for year, count in data.items())
+
+    # Running totals of the counts
+    cumulative = list(accumulate(count for _, count in sorted_data))
+    total_count = cumulative[-1] if cumulative else 0
+
+    # Cut where the running total is closest to each k/n share of the total
+    year_count = len(sorted_data)
+    cuts = []
+    for k in range(1, n):
+        edge = total_count * k // n
+        cut = bisect_left(cumulative, edge)
+        if cut < len(cumulative) and cumulative[cut] - edge <= edge - (cumulative[cut - 1] if cut else 0):
+            cut += 1
+        # Keep cuts strictly increasing while years remain, so no part is left empty when n <= len(data);
+        # with more parts than years each part gets one year and the rest are empty
+        cut = max((cuts[-1] if cuts else 0) + 1, min(cut, year_count - (n - k)))
+        cuts.append(min(cut, year_count))
+
+    # Slice the sorted years into n contiguous parts, converting counts back to strings
+    bounds = [0] + cuts + [len(sorted_data)]
+    return [{year: str(count) for year, count in sorted_data[start:end]} for start, end in zip(bounds, bounds[1:])]
+
+
 if __name__ == "__main__":
     # Test with your problematic case
     ranges = get_all_dates_in_year(2022, 81610)
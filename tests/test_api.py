@@ -0,0 +1,242 @@
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import orjson
+import requests
+
+from src.api import ECourtsScraper, TokenBucket, search_many
+
+
+class FakeResponse:
+    """Just enough of requests.Response for the scraper: a JSON or raw body and a status code"""
+
+    def __init__(self, payload=None, body=b"", status_code=200):
+        self.status_code = status_code
+        self.headers = {}
+        self.content = orjson.dumps(payload) if payload is not None else body
+        self.raw = io.BytesIO(body)
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.raw.close()
+
+
+class FakeSession(requests.Session):
+    """Session whose requests are answered by handler(method, url, data) instead of the network"""
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+        self.posted = []
+
+    def post(self, url, data=None, **kwargs):
+        self.posted.append(data)
+        return self.handler("POST", url, data)
+
+    def get(self, url, **kwargs):
+        return self.handler("GET", url, None)
+
+
+def make_scraper(handler):
+    """A verified scraper that talks to a FakeSession, built without touching eCourts or an OCR backend"""
+    with patch.object(ECourtsScraper, "initialize_session"), patch("src.api.ddddocr", object()):
+        with patch.dict(os.environ, {"USE_AZURE_OCR": ""}):
+            scraper = ECourtsScraper("19")
+    scraper.session = FakeSession(handler)
+    scraper.app_token = "token"
+    scraper.verified = True
+    return scraper
+
+
+class BulkDownloadJudgmentsTest(unittest.TestCase):
+    @staticmethod
+    def serve_pdfs(method, url, data):
+        if method == "POST":
+            # No CAPTCHA asked for: the PDF info reply points straight at the file
+            return FakeResponse({"outputfile": "/files/" + data["val"] + ".pdf", "app_token": "next"})
+        return FakeResponse(body=b"%PDF " + url.rsplit("/", 1)[-1].encode())
+
+    def test_results_come_back_in_input_order(self):
+        scraper = make_scraper(self.serve_pdfs)
+        pdf_details = [(str(i), f"court/orders/{i}.pdf") for i in range(6)]
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = scraper.bulk_download_judgments(pdf_details, output_dir=output_dir, max_workers=3)
+
+            self.assertEqual(len(results), len(pdf_details))
+            for (val, _), (local_path, file_name) in zip(pdf_details, results):
+                self.assertEqual(os.path.dirname(local_path), output_dir)
+                self.assertEqual(os.path.basename(local_path), file_name)
+                with open(local_path, "rb") as f:
+                    self.assertEqual(f.read(), f"%PDF {val}.pdf".encode())
+
+            with open(os.path.join(output_dir, "filename_mappings.jsonl"), "rb") as f:
+                mappings = [orjson.loads(line) for line in f]
+            self.assertEqual(len(mappings), len(pdf_details))
+
+    def test_failed_download_is_none_in_its_slot(self):
+        def handler(method, url, data):
+            if method == "POST" and data["val"] == "1":
+                return FakeResponse({"errormsg": "not found"})
+            return self.serve_pdfs(method, url, data)
+
+        scraper = make_scraper(handler)
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = scraper.bulk_download_judgments(
+                [("0", "a/0.pdf"), ("1", "a/1.pdf"), ("2", "a/2.pdf")], output_dir=output_dir
+            )
+        self.assertIsNotNone(results[0])
+        self.assertIsNone(results[1])
+        self.assertIsNotNone(results[2])
+
+
+def paged_search(rows):
+    """Handler answering searches with the requested slice of rows"""
+
+    def handler(method, url, data):
+        start, length = int(data["iDisplayStart"]), int(data["iDisplayLength"])
+        page = rows[start : start + length]
+        return FakeResponse({"reportrow": {"aaData": page, "iTotalRecords": str(len(rows))}, "app_token": f"t{start}"})
+
+    return handler
+
+
+class IterCasesTest(unittest.TestCase):
+    def test_rows_stream_across_pages(self):
+        rows = [[i] for i in range(5)]
+        scraper = make_scraper(paged_search(rows))
+
+        self.assertEqual(list(scraper.iter_cases(display_length=2, from_date="01-01-2024")), rows)
+
+        posted = scraper.session.posted
+        self.assertEqual([data["iDisplayStart"] for data in posted], ["0", "2", "4"])
+        self.assertEqual([data["sEcho"] for data in posted], ["1", "2", "3"])
+        self.assertTrue(all(data["from_date"] == "01-01-2024" for data in posted))
+        # Each page goes out with the token the previous reply handed back
+        self.assertEqual([data["app_token"] for data in posted], ["token", "t0", "t2"])
+
+    def test_stops_at_total_without_an_extra_request(self):
+        scraper = make_scraper(paged_search([[i] for i in range(4)]))
+        self.assertEqual(len(list(scraper.iter_cases(display_length=2))), 4)
+        self.assertEqual(len(scraper.session.posted), 2)
+
+    def test_no_results(self):
+        scraper = make_scraper(paged_search([]))
+        self.assertEqual(list(scraper.iter_cases()), [])
+        self.assertEqual(len(scraper.session.posted), 1)
+
+
+class SearchManyTest(unittest.TestCase):
+    def test_each_query_gets_its_own_result_and_a_scraper_serves_one_at_a_time(self):
+        in_flight = {}
+        overlapped = []
+        lock = threading.Lock()
+
+        def make_handler(name):
+            def handler(method, url, data):
+                with lock:
+                    in_flight[name] = in_flight.get(name, 0) + 1
+                    overlapped.append(in_flight[name] > 1)
+                time.sleep(0.01)
+                with lock:
+                    in_flight[name] -= 1
+                rows = [[data["search_txt1"]]]
+                return FakeResponse({"reportrow": {"aaData": rows, "iTotalRecords": "1"}, "app_token": "next"})
+
+            return handler
+
+        scrapers = [make_scraper(make_handler(name)) for name in ("a", "b")]
+        queries = [{"search_text": f"q{i}", "display_length": 1} for i in range(6)]
+
+        results = list(search_many(scrapers, queries))
+
+        self.assertEqual(len(results), len(queries))
+        for query, result in results:
+            self.assertEqual(result["reportrow"]["aaData"], [[query["search_text"]]])
+        self.assertFalse(any(overlapped))
+        self.assertEqual(sum(len(scraper.session.posted) for scraper in scrapers), len(queries))
+
+    def test_failed_search_yields_none(self):
+        scraper = make_scraper(lambda method, url, data: FakeResponse({"message": "no rows"}))
+        self.assertEqual(list(search_many([scraper], [{"search_text": "x"}])), [({"search_text": "x"}, None)])
+
+
+class FakeClock:
+    """monotonic/sleep pair where sleeping just moves the clock forward"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch.multiple("src.api.time", monotonic=self.clock.monotonic, sleep=self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_paced_at_rate(self):
+        bucket = TokenBucket(rate=4, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(self.clock.slept, [])
+
+        bucket.acquire()
+        self.assertAlmostEqual(self.clock.now, 0.25)
+
+    def test_idle_time_refills_up_to_capacity(self):
+        bucket = TokenBucket(rate=4, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+        self.clock.now += 10
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(self.clock.slept, [])
+        bucket.acquire()
+        self.assertAlmostEqual(self.clock.now, 10.25)
+
+    def test_rejects_non_positive_rate_or_capacity(self):
+        for rate, capacity in ((0, 5), (-1, 5), (5, 0)):
+            with self.subTest(rate=rate, capacity=capacity), self.assertRaises(ValueError):
+                TokenBucket(rate=rate, capacity=capacity)
+
+
+class PlausibleCaptchaTest(unittest.TestCase):
+    def setUp(self):
+        self.scraper = make_scraper(lambda method, url, data: FakeResponse({}))
+
+    def test_whitespace_is_stripped_from_plausible_answers(self):
+        self.assertEqual(self.scraper._plausible_captcha(" ab 12\n"), "ab12")
+        self.assertEqual(self.scraper._plausible_captcha("Xy7kQ9zA"), "Xy7kQ9zA")
+
+    def test_implausible_text_is_discarded(self):
+        for text in ("", "ab1", "abcdefghi", "ab$1", "ab-12"):
+            with self.subTest(text=text):
+                self.assertIsNone(self.scraper._plausible_captcha(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import queue
+import threading
+import unittest
+from unittest.mock import patch
+
+from pymongo.errors import BulkWriteError
+
+import main
+from main import MongoWriter, page_producer
+
+
+class FakeCollection:
+    """Records every insert_many call; the first `fail_first` calls raise a duplicate-key BulkWriteError"""
+
+    def __init__(self, fail_first=0):
+        self.writes = []
+        self.fail_first = fail_first
+
+    def insert_many(self, docs, **kwargs):
+        self.writes.append(list(docs))
+        if len(self.writes) <= self.fail_first:
+            raise BulkWriteError({"writeErrors": [{"index": 0, "code": 11000, "errmsg": "dup"}], "nInserted": 0})
+
+
+class MongoWriterTest(unittest.TestCase):
+    def test_flush_waits_for_queued_documents(self):
+        collection = FakeCollection()
+        writer = MongoWriter(collection, flush_size=100)
+        self.addCleanup(writer.close)
+
+        writer.put([1, 2])
+        writer.put([3])
+        writer.flush()
+        self.assertEqual(collection.writes, [[1, 2, 3]])
+
+        # Nothing new queued: a second barrier writes nothing
+        writer.flush()
+        self.assertEqual(collection.writes, [[1, 2, 3]])
+
+    def test_full_buffer_is_written_without_a_flush(self):
+        collection = FakeCollection()
+        writer = MongoWriter(collection, flush_size=2)
+        self.addCleanup(writer.close)
+
+        writer.put([1])
+        writer.put([2, 3])
+        writer.put([4])
+        writer.flush()
+        self.assertEqual(collection.writes, [[1, 2, 3], [4]])
+
+    def test_close_drains_the_queue_and_stops_the_thread(self):
+        collection = FakeCollection()
+        writer = MongoWriter(collection, flush_size=100)
+        writer.put([1])
+        writer.put([])
+        writer.put([2])
+        writer.close()
+
+        self.assertEqual(collection.writes, [[1, 2]])
+        self.assertFalse(writer.thread.is_alive())
+
+    def test_write_errors_do_not_stop_the_writer(self):
+        collection = FakeCollection(fail_first=1)
+        writer = MongoWriter(collection, flush_size=100)
+        self.addCleanup(writer.close)
+
+        writer.put([1])
+        writer.flush()
+        writer.put([2])
+        writer.flush()
+        self.assertEqual(collection.writes, [[1], [2]])
+
+
+def fake_fetch_page(scraper, start_date, end_date, req_no):
+    if req_no == 2:
+        raise RuntimeError("fetch failed")
+    return {"req_no": req_no}
+
+
+@patch.object(main, "fetch_page", fake_fetch_page)
+class PageProducerTest(unittest.TestCase):
+    SCRAPERS = ("s1", "s2")
+
+    def start(self, req_numbers, maxsize=1):
+        scraper_pool = queue.Queue()
+        for scraper in self.SCRAPERS:
+            scraper_pool.put(scraper)
+        page_queue = queue.Queue(maxsize=maxsize)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=page_producer, args=(scraper_pool, page_queue, "01-01-2024", "31-01-2024", req_numbers, stop)
+        )
+        producer.start()
+        return scraper_pool, page_queue, stop, producer
+
+    def test_pages_arrive_in_order_then_none(self):
+        scraper_pool, page_queue, _, producer = self.start(range(6))
+
+        received = []
+        while (page := page_queue.get(timeout=5)) is not None:
+            req_no, scraper, search_results = page
+            received.append((req_no, search_results))
+            scraper_pool.put(scraper)
+        producer.join(timeout=5)
+
+        self.assertFalse(producer.is_alive())
+        # A failed fetch is still delivered, with no results, so its scraper comes back
+        self.assertEqual(received, [(i, None if i == 2 else {"req_no": i}) for i in range(6)])
+        self.assertEqual(scraper_pool.qsize(), len(self.SCRAPERS))
+
+    def test_stop_drains_fetched_pages_and_returns_every_scraper(self):
+        scraper_pool, page_queue, stop, producer = self.start(range(100))
+
+        # The consumer fails on the first page and drains the rest the way main() does
+        _, scraper, _ = page_queue.get(timeout=5)
+        stop.set()
+        scraper_pool.put(scraper)
+        drained = 0
+        while (page := page_queue.get(timeout=5)) is not None:
+            scraper_pool.put(page[1])
+            drained += 1
+        producer.join(timeout=5)
+
+        self.assertFalse(producer.is_alive())
+        self.assertLess(drained, 99)
+        self.assertEqual(scraper_pool.qsize(), len(self.SCRAPERS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+
+from src.parser import (
+    _HEADING_OF_RE,
+    CaseDetail,
+    _extract_judgment_metadata_fast,
+    _extract_judgment_metadata_soup,
+    extract_judgment_metadata,
+)
+
+ONCLICK = "open_pdf('0','','court/cnrorders/dhcdb/orders/DLHC010281202025_1_2025-05-08.pdf#page=')"
+
+# Rows the regex fast path should read itself
+FAST_ROWS = [
+    f"""<button type="button" class="btn" onclick="{ONCLICK}">W.P.(C)/1234/2024 of Ram &amp; Sons vs Union</button>"""
+    """<br><strong>Judge : HON'BLE MR. JUSTICE X</strong><br>Decision Date : 08-05-2025""",
+    """<div><button onclick='open_pdf("1","","a/b.pdf")'>CRL/5/2020 of State</button>"""
+    """<strong class="caseDetailsTD"><span>CNR :</span><font>ABC</font></strong> 01-02-2020</div>""",
+    """<button onclick="open_pdf('0','','a>b.pdf')">CRL/5/2020 of State</button><strong>Judge : Y</strong>""",
+    """<button data-x="1>2" onclick="open_pdf('0','','a/b.pdf')">CRL/5/2020 of State</button><strong>Judge : Y</strong>""",
+    """<button onclick="open_pdf('0','','a/b.pdf')"><span title="a>b">CRL/5/2020</span> of State</button>"""
+    """<strong>Judge : Y</strong>""",
+    """<button onclick="open_pdf('0','','orders/01-01-1999/a.pdf')">CRL/5/2020 of State</button>"""
+    """<strong>Judge : Y</strong> Decision Date : 08-05-2025""",
+]
+
+# Rows the fast path must hand over to BeautifulSoup
+SOUP_ROWS = [
+    """<button onclick="open_pdf('0','','a/b.pdf')">CRL/5/2020 of State</button>"""
+    """<strong>Judge : in <strong>out</strong></strong>""",
+    """<script>var s = "<strong>Judge : fake</strong>";</script>"""
+    """<button onclick="open_pdf('0','','a/b.pdf')">CRL/5/2020 of State</button><strong>Judge : real</strong>""",
+    """<button>CRL/5/2020 of State</button><strong>Judge : Y</strong>""",
+    """<button onclick="open_pdf('0','','a/b.pdf')">CRL/5/2020 of State</button><!-- <strong>x</strong> -->"""
+    """<strong>Judge : Y</strong>""",
+    """<div data-judgment-id="77"><button onclick="open_pdf('0','','a/b.pdf')">CRL/5/2020 of State</button>"""
+    """<strong>Judge : Y</strong></div>""",
+    """<button>nothing here</button>""",
+]
+
+
+class ExtractJudgmentMetadataTest(unittest.TestCase):
+    def test_fast_path_matches_soup(self):
+        for row in FAST_ROWS:
+            with self.subTest(row=row):
+                fast = _extract_judgment_metadata_fast(row)
+                self.assertIsNotNone(fast)
+                self.assertEqual(fast, _extract_judgment_metadata_soup(row))
+
+    def test_unusual_rows_fall_back_to_soup(self):
+        for row in SOUP_ROWS:
+            with self.subTest(row=row):
+                self.assertIsNone(_extract_judgment_metadata_fast(row))
+                self.assertEqual(extract_judgment_metadata(row), _extract_judgment_metadata_soup(row))
+
+    def test_quoted_greater_than_keeps_pdf_url(self):
+        metadata = extract_judgment_metadata(FAST_ROWS[2])
+        self.assertEqual(metadata["pdf_url"], ("0", "a>b.pdf"))
+        self.assertEqual(metadata["case_type"], "crl")
+
+    def test_date_comes_from_displayed_text_not_onclick(self):
+        row = FAST_ROWS[-1]
+        self.assertEqual(_extract_judgment_metadata_fast(row)["judgment_date"], "08-05-2025")
+        self.assertEqual(_extract_judgment_metadata_soup(row)["judgment_date"], "08-05-2025")
+
+    def test_judge_comes_from_markup_outside_scripts(self):
+        self.assertEqual(extract_judgment_metadata(SOUP_ROWS[1])["judge"], "real")
+
+
+class HeadingOfTest(unittest.TestCase):
+    def test_splits_on_first_standalone_of_in_any_case(self):
+        for heading, expected in (
+            ("CRL/5/2020 of State", ("CRL/5/2020", "State")),
+            ("CRL/5/2020 OF State", ("CRL/5/2020", "State")),
+            ("WP/1/2021 Of Board of Control", ("WP/1/2021", "Board of Control")),
+            ("WP/1/2021\nof\tState", ("WP/1/2021", "State")),
+        ):
+            with self.subTest(heading=heading):
+                self.assertEqual(_HEADING_OF_RE.match(heading).groups(), expected)
+
+    def test_of_inside_a_word_is_not_a_separator(self):
+        for heading in ("WP/1/2021 Office Memo", "WP/1/2021of State", "Profit", "CRL/5/2020 of"):
+            with self.subTest(heading=heading):
+                self.assertIsNone(_HEADING_OF_RE.match(heading))
+
+    def test_metadata_title_from_upper_case_of(self):
+        row = """<button onclick="open_pdf('0','','a/b.pdf')">CRL/5/2020 OF State</button><strong>Judge : Y</strong>"""
+        metadata = extract_judgment_metadata(row)
+        self.assertEqual(metadata["title"], "state")
+        self.assertEqual(metadata["case_type"], "crl")
+
+
+class CaseDetailTest(unittest.TestCase):
+    def test_to_dict_leaves_out_unset_fields_and_merges_extra(self):
+        detail = CaseDetail(title="state", year="2020")
+        detail.set("judge", "y")
+        detail.set("case_id", "a/b.pdf")
+        detail.set("court", "")
+
+        self.assertEqual(detail.judge, "y")
+        self.assertEqual(detail.extra, {"case_id": "a/b.pdf"})
+        self.assertEqual(
+            detail.to_dict(), {"title": "state", "year": "2020", "judge": "y", "court": "", "case_id": "a/b.pdf"}
+        )
+
+    def test_empty_detail_is_empty_dict(self):
+        self.assertEqual(CaseDetail().to_dict(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
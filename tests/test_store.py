@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+
+from src.store import SeenUrlStore
+
+
+class SeenUrlStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "state", "seen.db")
+
+    def committed_urls(self):
+        """URLs another connection can see, i.e. the committed rows"""
+        with closing(sqlite3.connect(self.path)) as conn:
+            return {url for (url,) in conn.execute("SELECT url FROM seen_urls")}
+
+    def test_get_returns_blob_url_of_added_path(self):
+        store = SeenUrlStore(self.path)
+        self.addCleanup(store.close)
+        self.assertIsNone(store.get("a.pdf"))
+        store.add("a.pdf", "https://blob/a")
+        store.add("a.pdf", "https://blob/a2")
+        self.assertEqual(store.get("a.pdf"), "https://blob/a2")
+
+    def test_rows_are_committed_in_groups(self):
+        store = SeenUrlStore(self.path, commit_every=3)
+        self.addCleanup(store.close)
+        store.add("a.pdf", "1")
+        store.add("b.pdf", "2")
+        self.assertEqual(self.committed_urls(), set())
+
+        store.add("c.pdf", "3")
+        self.assertEqual(self.committed_urls(), {"a.pdf", "b.pdf", "c.pdf"})
+
+        store.add("d.pdf", "4")
+        store.commit()
+        self.assertEqual(self.committed_urls(), {"a.pdf", "b.pdf", "c.pdf", "d.pdf"})
+
+    def test_reopen_after_crash_keeps_committed_rows_only(self):
+        store = SeenUrlStore(self.path, commit_every=100)
+        store.add("a.pdf", "1")
+        store.commit()
+        store.add("b.pdf", "2")
+        # A crash: the connection goes away without close() committing the pending row
+        store.conn.close()
+
+        reopened = SeenUrlStore(self.path, commit_every=100)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.get("a.pdf"), "1")
+        self.assertIsNone(reopened.get("b.pdf"))
+        reopened.add("b.pdf", "2")
+        self.assertEqual(reopened.get("b.pdf"), "2")
+
+    def test_close_commits_pending_rows(self):
+        store = SeenUrlStore(self.path, commit_every=100)
+        store.add("a.pdf", "1")
+        store.close()
+        self.assertEqual(self.committed_urls(), {"a.pdf"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from src.utils import decode_env, divide_data
+
+YEARS = {"2018": "5000", "2019": "6000", "2020": "3000", "2021": "8000", "2022": "9000", "2023": "7000", "2024": "2000"}
+
+
+def part_sums(parts):
+    return [sum(int(count) for count in part.values()) for part in parts]
+
+
+class DivideDataTest(unittest.TestCase):
+    def test_no_part_is_empty_when_parts_do_not_exceed_years(self):
+        for n in range(1, len(YEARS) + 1):
+            with self.subTest(n=n):
+                parts = divide_data(YEARS, n)
+                self.assertEqual(len(parts), n)
+                self.assertTrue(all(parts))
+                self.assertEqual(sum(part_sums(parts)), sum(map(int, YEARS.values())))
+
+    def test_one_year_per_part_when_parts_equal_years(self):
+        self.assertEqual(part_sums(divide_data(YEARS, 7)), [5000, 6000, 3000, 8000, 9000, 7000, 2000])
+
+    def test_extra_parts_are_empty_and_come_last(self):
+        self.assertEqual([len(part) for part in divide_data(YEARS, 10)], [1] * 7 + [0] * 3)
+
+    def test_years_stay_contiguous_and_in_order(self):
+        parts = divide_data(YEARS, 3)
+        self.assertEqual([year for part in parts for year in part], sorted(YEARS))
+
+    def test_non_positive_part_count_is_rejected(self):
+        for n in (0, -1):
+            with self.subTest(n=n), self.assertRaises(ValueError):
+                divide_data(YEARS, n)
+
+
+class DecodeEnvTest(unittest.TestCase):
+    @patch.dict(os.environ, {"URI": "mongodb+srv\\x3a//host\\x3A27017", "PLAIN": "https://host"})
+    def test_escaped_colons_are_decoded(self):
+        self.assertEqual(decode_env("URI"), "mongodb+srv://host:27017")
+        self.assertEqual(decode_env("PLAIN"), "https://host")
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_missing_variable_gives_default(self):
+        self.assertIsNone(decode_env("URI"))
+        self.assertEqual(decode_env("URI", ""), "")
+        self.assertEqual(decode_env("URI", "a\\x3ab"), "a:b")
+
+
+if __name__ == "__main__":
+    unittest.main()